@@ -0,0 +1,215 @@
+import math
+from collections import deque
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+DEFAULT_RULE = {
+    'window': 60,      # Previous samples each sample is compared with
+    'min_count': 10,   # Valid samples the window needs before judging
+    'z': 3.0,          # Rolling z-score limit, or None
+    'mad': 3.5,        # Rolling robust z-score (median / MAD) limit, or None
+    'rate': None       # Largest plausible change per hour, or None
+}
+
+# Scaling that makes the MAD estimate the standard deviation of normal data
+MAD_SCALE = 1.4826
+
+# Rows of windows taken at once by scan(), bounding its memory
+SCAN_ROWS = 65536
+
+
+def _nanmedian_rows(windows):
+    """Median of each row, skipping NaN; NaN for rows without values."""
+    medians = np.median(windows, axis=1)
+    gaps = np.isnan(medians)
+    if gaps.any():
+        rows = windows[gaps]
+        has_values = ~np.isnan(rows).all(axis=1)
+        medians[np.flatnonzero(gaps)[has_values]] = np.nanmedian(rows[has_values], axis=1)
+    return medians
+
+
+class AnomalyDetector:
+    """Flag samples that break per-field z-score, MAD or rate-of-change rules.
+
+    Each sample is compared with the previous ``window`` samples of its
+    field (NaN gaps skipped): it is a z-score anomaly when it is more than
+    ``z`` standard deviations from the window mean, a MAD anomaly when it
+    is more than ``mad`` scaled median absolute deviations from the window
+    median, and a rate anomaly when it changed by more than ``rate`` per
+    hour since the previous sample. Flags are the bitwise or of Z_SCORE,
+    MAD and RATE.
+
+    scan() runs vectorized over historical arrays. update() and extend()
+    check live samples against the samples seen before them, keeping only
+    the last window per field.
+    """
+
+    Z_SCORE = 1
+    MAD = 2
+    RATE = 4
+
+    def __init__(self, fields, rules=None, **defaults):
+        """Watch fields; rules maps a field to overrides of DEFAULT_RULE and defaults."""
+        self.fields = list(fields)
+        self.rules = {}
+        for field in self.fields:
+            rule = dict(DEFAULT_RULE, **defaults)
+            rule.update((rules or {}).get(field, {}))
+            self.rules[field] = rule
+        self.reset()
+
+    def reset(self):
+        """Forget the live samples seen so far."""
+        self.history = {field: deque(maxlen=self.rules[field]['window']) for field in self.fields}
+        self.last_sample = {field: (math.nan, math.nan) for field in self.fields}
+
+    @classmethod
+    def describe(cls, flags):
+        """Names of the rules set in flags, e.g. 'z-score, rate'."""
+        names = [name for bit, name in ((cls.Z_SCORE, 'z-score'), (cls.MAD, 'MAD'), (cls.RATE, 'rate'))
+                 if flags & bit]
+        return ', '.join(names)
+
+    def scan(self, timestamps, data):
+        """Flag anomalies in historical columns without touching the live state.
+
+        Returns {field: (indices, flags)} for the anomalous samples of each
+        watched field present in data.
+        """
+        timestamps = np.asarray(timestamps, dtype=float)
+        found = {}
+        for field in self.fields:
+            if field in data:
+                flags = self._flags(self.rules[field], timestamps,
+                                    np.asarray(data[field], dtype=float), 0)
+                indices = np.flatnonzero(flags)
+                found[field] = (indices, flags[indices])
+        return found
+
+    def extend(self, timestamps, data):
+        """Check a batch of live samples, given as columns; returns like scan()."""
+        timestamps = np.asarray(timestamps, dtype=float)
+        found = {}
+        for field in self.fields:
+            values = data.get(field)
+            if values is None:
+                values = np.full(len(timestamps), np.nan)
+            values = np.asarray(values, dtype=float)
+
+            # Prepend the remembered window so the batch is judged in context
+            history = self.history[field]
+            last_time, last_value = self.last_sample[field]
+            context = np.array(history, dtype=float)
+            times = np.concatenate([np.full(len(context), np.nan), timestamps])
+            if len(context):
+                times[len(context) - 1] = last_time
+
+            flags = self._flags(self.rules[field], times, np.concatenate([context, values]), len(context))
+            if field in data:
+                indices = np.flatnonzero(flags)
+                found[field] = (indices, flags[indices])
+
+            history.extend(values[-history.maxlen:].tolist())
+            if len(values):
+                self.last_sample[field] = (timestamps[-1], float(values[-1]))
+        return found
+
+    def update(self, timestamp, data_dict):
+        """Check one live sample; returns [(field, value, flags)] for its anomalies."""
+        found = []
+        for field in self.fields:
+            value = float(data_dict.get(field, math.nan))
+            history = self.history[field]
+            rule = self.rules[field]
+            last_time, last_value = self.last_sample[field]
+
+            if not math.isnan(value):
+                flags = self._window_flags(rule, [v for v in history if not math.isnan(v)], value)
+                if rule['rate'] is not None and not math.isnan(last_value) and timestamp > last_time:
+                    if abs(value - last_value) / ((timestamp - last_time) * 24) > rule['rate']:
+                        flags |= self.RATE
+                if flags:
+                    found.append((field, value, flags))
+
+            history.append(value)
+            self.last_sample[field] = (timestamp, value)
+        return found
+
+    def _window_flags(self, rule, window, value):
+        """z-score and MAD flags of value against the valid values of its window."""
+        count = len(window)
+        if count < rule['min_count']:
+            return 0
+
+        flags = 0
+        if rule['z'] is not None:
+            mean = sum(window) / count
+            std = math.sqrt(sum((v - mean) ** 2 for v in window) / count)
+            if std > 0 and abs(value - mean) > rule['z'] * std:
+                flags |= self.Z_SCORE
+
+        if rule['mad'] is not None:
+            ordered = sorted(window)
+            median = (ordered[(count - 1) // 2] + ordered[count // 2]) / 2
+            deviations = sorted(abs(v - median) for v in window)
+            scale = MAD_SCALE * (deviations[(count - 1) // 2] + deviations[count // 2]) / 2
+            if scale > 0 and abs(value - median) > rule['mad'] * scale:
+                flags |= self.MAD
+        return flags
+
+    def _flags(self, rule, times, values, start):
+        """Flags of values[start:], each judged against the window before it."""
+        n = len(values)
+        window = rule['window']
+        flags = np.zeros(n - start, dtype=np.uint8)
+        if n == start:
+            return flags
+
+        valid = ~np.isnan(values)
+        current = values[start:]
+
+        # Window counts, means and spreads from prefix sums, centred for accuracy
+        offset = values[valid].mean() if valid.any() else 0.0
+        centred = np.where(valid, values - offset, 0.0)
+        counts = np.concatenate([[0], np.cumsum(valid)])
+        sums = np.concatenate([[0.0], np.cumsum(centred)])
+        squares = np.concatenate([[0.0], np.cumsum(centred ** 2)])
+        hi = np.arange(start, n)
+        lo = np.maximum(hi - window, 0)
+        count = counts[hi] - counts[lo]
+        judged = valid[start:] & (count >= rule['min_count'])
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            if rule['z'] is not None:
+                mean = (sums[hi] - sums[lo]) / count
+                std = np.sqrt(np.maximum((squares[hi] - squares[lo]) / count - mean ** 2, 0))
+                hit = judged & (std > 0) & (np.abs(current - offset - mean) > rule['z'] * std)
+                flags[hit] |= self.Z_SCORE
+
+            if rule['mad'] is not None:
+                # Row i of the padded view is the window before sample i
+                padded = np.concatenate([np.full(window, np.nan), values[:-1]])
+                windows = sliding_window_view(padded, window)
+                for first in range(start, n, SCAN_ROWS):
+                    rows = slice(first, min(first + SCAN_ROWS, n))
+                    part = windows[rows]
+                    median = _nanmedian_rows(part)
+                    scale = MAD_SCALE * _nanmedian_rows(np.abs(part - median[:, None]))
+                    out = slice(rows.start - start, rows.stop - start)
+                    hit = (judged[out] & (scale > 0)
+                           & (np.abs(values[rows] - median) > rule['mad'] * scale))
+                    flags[out][hit] |= self.MAD
+
+            if rule['rate'] is not None:
+                before = np.arange(start, n) - 1
+                has_before = before >= 0
+                before = np.maximum(before, 0)
+                elapsed = (times[start:] - times[before]) * 24
+                change = np.abs(current - values[before])
+                hit = (has_before & valid[start:] & (elapsed > 0)
+                       & (change / elapsed > rule['rate']))
+                flags[hit] |= self.RATE
+        return flags
@@ -0,0 +1,99 @@
+class AxisSyncScheduler:
+    """Synchronize x-limits across charts with one batched redraw per idle cycle.
+
+    Limit changes are deduplicated, callbacks fired while a change is being
+    propagated are ignored, and redraw requests are collected until the
+    scheduled flush, which refreshes and redraws each dirty chart once.
+    """
+
+    def __init__(self, schedule=None):
+        # schedule(fn) runs fn once the GUI is idle, e.g. a Tk widget's
+        # after_idle; without one, every request is flushed immediately
+        self.schedule = schedule
+        self.members = {}  # ax -> {'canvas': ..., 'on_sync': ...}
+        self.stats = {}
+        self.reset_stats()
+
+        self._syncing = False
+        self._last_xlim = None
+        self._dirty = []
+        self._flush_scheduled = False
+
+    @property
+    def pending(self):
+        """Number of charts waiting for the next flush."""
+        return len(self._dirty)
+
+    def add(self, ax, canvas, on_sync=None):
+        """Synchronize an axes; on_sync() runs before each redraw of its chart."""
+        self.members[ax] = {'canvas': canvas, 'on_sync': on_sync}
+        ax.callbacks.connect('xlim_changed', self._on_xlim_changed)
+
+    def reset_stats(self):
+        """Zero the counters."""
+        self.stats.update({
+            'xlim_events': 0,       # xlim_changed callbacks received
+            'duplicate_events': 0,  # ignored, limits already synchronized
+            'reentrant_events': 0,  # ignored, fired while propagating
+            'sync_passes': 0,       # limit changes propagated
+            'redraw_requests': 0,   # charts marked dirty
+            'flushes': 0,           # batched flushes run
+            'redraws': 0            # draw_idle calls issued
+        })
+
+    def _on_xlim_changed(self, ax):
+        """Propagate a limit change to the other charts."""
+        self.stats['xlim_events'] += 1
+        if self._syncing:
+            self.stats['reentrant_events'] += 1
+            return
+
+        xlim = tuple(ax.get_xlim())
+        if xlim == self._last_xlim:
+            self.stats['duplicate_events'] += 1
+            return
+
+        self._last_xlim = xlim
+        self.stats['sync_passes'] += 1
+        self._syncing = True
+        try:
+            shared = ax.get_shared_x_axes()
+            for other in self.members:
+                # matplotlib already moves axes joined by sharex
+                if other is ax or shared.joined(ax, other):
+                    continue
+                # auto=None leaves each chart's autoscaling untouched
+                if tuple(other.get_xlim()) != xlim:
+                    other.set_xlim(xlim, auto=None)
+        finally:
+            self._syncing = False
+
+        for member in self.members:
+            self.request_redraw(member)
+
+    def request_redraw(self, ax):
+        """Mark a chart dirty; it is refreshed and redrawn at the next flush."""
+        self.stats['redraw_requests'] += 1
+        if ax not in self._dirty:
+            self._dirty.append(ax)
+
+        if self.schedule is None:
+            self.flush()
+        elif not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.schedule(self.flush)
+
+    def flush(self):
+        """Refresh and redraw every dirty chart once."""
+        self._flush_scheduled = False
+        dirty, self._dirty = self._dirty, []
+        if not dirty:
+            return
+
+        self.stats['flushes'] += 1
+        for ax in dirty:
+            member = self.members[ax]
+            if member['on_sync'] is not None:
+                member['on_sync']()
+            member['canvas'].draw_idle()
+            self.stats['redraws'] += 1
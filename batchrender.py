@@ -0,0 +1,197 @@
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from datelabels import DateLabelFormatter
+from downsampling import minmax_downsample
+from interactiveoverlays import WeatherOverlay
+from precipitationbars import PrecipitationBars
+from visualthemes import WeatherChartTheme
+from weatherdatastore import WeatherDataStore
+
+
+DEFAULT_SPEC = {
+    'panels': ('temperature', 'precipitation', 'wind', 'pressure'),
+    'theme': 'light',
+    'title': None,
+    'size': (12, 12),  # Inches, for the whole dashboard
+    'dpi': 100,
+    'format': None,  # From the output file name, else 'png'
+    'time_range': None,  # (start, end) date numbers, default all data
+    'overlays': ()  # Dicts with 'type', 'panel' and WeatherOverlay arguments
+}
+
+# Overlay 'type' -> WeatherOverlay method
+OVERLAY_METHODS = {
+    'threshold': 'add_temperature_threshold',
+    'range': 'add_time_range_highlight',
+    'anomalies': 'add_anomaly_markers',
+    'trend': 'add_trend_line'
+}
+
+
+def load_weather_data(source, time_range=None):
+    """Dataset from a WeatherDataStore, dict, WeatherArchive directory or CSV/Parquet file."""
+    if isinstance(source, (str, os.PathLike)):
+        if os.path.isdir(source):
+            from weatherarchive import WeatherArchive
+            return WeatherArchive(source).time_slice(*(time_range or (None, None)))
+
+        from weatheringest import read_chunks
+        store = WeatherDataStore()
+        for chunk in read_chunks(os.fspath(source)):
+            store.append(chunk)
+        source = store
+
+    if not isinstance(source, WeatherDataStore):
+        source = WeatherDataStore(source)
+    if time_range is not None:
+        source = source.time_slice(*time_range)
+    return source
+
+
+def _reduce(x, y, width):
+    """Min/max-decimate a series to about two points per pixel column."""
+    return minmax_downsample(np.asarray(x), np.asarray(y), width)
+
+
+def _plot_temperature(ax, data, width):
+    ax.plot(*_reduce(data['timestamps'], data['temperature'], width), 'r-', label='Temperature')
+    if 'feels_like' in data:
+        ax.plot(*_reduce(data['timestamps'], data['feels_like'], width),
+                'r--', alpha=0.7, label='Feels Like')
+    ax.set_ylabel('Temperature (°C)')
+
+
+def _plot_precipitation(ax, data, width):
+    # Bars at least a pixel wide, keeping the wettest sample per pixel
+    x, y = _reduce(data['timestamps'], np.nan_to_num(data['precipitation']), width)
+    span = x[-1] - x[0] if len(x) > 1 else 1.0
+    bars = PrecipitationBars(ax, width=max(0.02, span / width), alpha=0.7, label='Precipitation')
+    bars.set_data(x, y)
+    ax.relim()
+    ax.autoscale_view()
+    ax.set_ylabel('Precipitation (mm)')
+
+
+def _plot_wind(ax, data, width):
+    ax.plot(*_reduce(data['timestamps'], data['wind_speed'], width), 'g-', label='Wind Speed')
+    ax.set_ylabel('Wind Speed (m/s)')
+    if 'wind_direction' in data:
+        ax2 = ax.twinx()
+        ax2.scatter(*_reduce(data['timestamps'], data['wind_direction'], width),
+                    c='blue', s=20, alpha=0.6, label='Direction')
+        ax2.set_ylabel('Wind Direction (°)', color='blue')
+        ax2.tick_params(axis='y', labelcolor='blue')
+
+
+def _plot_pressure(ax, data, width):
+    ax.plot(*_reduce(data['timestamps'], data['pressure'], width), 'b-', label='Pressure')
+    ax.set_ylabel('Pressure (hPa)')
+
+
+PANELS = {
+    'temperature': _plot_temperature,
+    'precipitation': _plot_precipitation,
+    'wind': _plot_wind,
+    'pressure': _plot_pressure
+}
+
+# Field each panel can't be drawn without
+PANEL_FIELDS = {
+    'temperature': 'temperature',
+    'precipitation': 'precipitation',
+    'wind': 'wind_speed',
+    'pressure': 'pressure'
+}
+
+
+def build_dashboard_figure(weather_data, spec=None):
+    """Lay the dashboard panels out in one Agg-backed Figure, never touching Tk."""
+    spec = dict(DEFAULT_SPEC, **(spec or {}))
+    data = load_weather_data(weather_data, spec['time_range'])
+
+    figure = Figure(figsize=spec['size'], dpi=spec['dpi'])
+    FigureCanvasAgg(figure)
+    panels = [name for name in spec['panels'] if name in PANELS]
+    axes = figure.subplots(len(panels), 1, sharex=True, squeeze=False)[:, 0]
+    width = int(spec['size'][0] * spec['dpi'])
+
+    for name, ax in zip(panels, axes):
+        if PANEL_FIELDS[name] in data:
+            PANELS[name](ax, data, width)
+        else:
+            # Keep the layout of the spec, but say why the panel is empty
+            ax.text(0.5, 0.5, f"No {PANEL_FIELDS[name].replace('_', ' ')} data",
+                    transform=ax.transAxes, ha='center', va='center', alpha=0.6)
+        WeatherChartTheme.apply_theme(figure, ax, spec['theme'])
+        ax.grid(True, alpha=0.3)
+        ax.margins(x=0.01)
+        ax.set_title(name.capitalize(), loc='left', fontsize=10)
+
+    for overlay in spec['overlays']:
+        overlay = dict(overlay)
+        method = OVERLAY_METHODS[overlay.pop('type')]
+        targets = [overlay.pop('panel')] if 'panel' in overlay else panels
+        for name in targets:
+            if name in panels:
+                getattr(WeatherOverlay(axes[panels.index(name)]), method)(**overlay)
+
+    for ax in axes:
+        if ax.get_legend_handles_labels()[0]:
+            ax.legend(loc='upper right')
+    axes[-1].xaxis.set_major_formatter(DateLabelFormatter('%m/%d %H:%M'))
+    figure.autofmt_xdate()
+    if spec['title']:
+        figure.suptitle(spec['title'])
+    return figure
+
+
+def render_dashboard(weather_data, spec=None, path=None):
+    """Render a dashboard; write it to path and return path, or return the image bytes.
+
+    weather_data is anything load_weather_data() accepts. The format is
+    spec['format'], else the file extension, else PNG.
+    """
+    spec = dict(DEFAULT_SPEC, **(spec or {}))
+    figure = build_dashboard_figure(weather_data, spec)
+
+    image_format = spec['format']
+    if image_format is None and path is not None:
+        image_format = os.path.splitext(os.fspath(path))[1].lstrip('.') or None
+    image_format = image_format or 'png'
+
+    if path is None:
+        buffer = io.BytesIO()
+        figure.savefig(buffer, format=image_format)
+        return buffer.getvalue()
+
+    figure.savefig(path, format=image_format)
+    return path
+
+
+def _render_job(job):
+    """Worker entry point: render one (weather_data, spec, path) job."""
+    weather_data, spec, path = job
+    return render_dashboard(weather_data, spec, path)
+
+
+def render_batch(jobs, processes=None):
+    """Render (weather_data, spec, path) jobs in worker processes, in order.
+
+    Figures are drawn on Agg canvases without pyplot, so this runs on
+    servers without a display and scales with the number of processes.
+    Pass file or archive paths as weather_data where possible, so each
+    worker loads its own data instead of receiving it pickled. Returns
+    the paths written, or image bytes for jobs whose path is None.
+    """
+    jobs = list(jobs)
+    if processes == 1 or len(jobs) <= 1:
+        return [_render_job(job) for job in jobs]
+
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        return list(pool.map(_render_job, jobs))
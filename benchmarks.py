@@ -0,0 +1,405 @@
+"""Headless benchmarks of the interactive hot paths.
+
+Runs on the Agg backend, so no display is needed. Each benchmark is timed
+over dataset sizes from 1e2 to 1e7 points, driven by synthetic
+MouseEvents where it handles input, and reports the median and p99
+latency per call and the peak memory allocated by one call. Results go
+to a JSON file; pass a previous file as --baseline to flag regressions.
+
+    python benchmarks.py --output results.json
+    python benchmarks.py --sizes 100 10000 --only hover click
+    python benchmarks.py --baseline results.json
+"""
+import argparse
+import json
+import platform
+import resource
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import matplotlib
+import numpy as np
+from matplotlib.backend_bases import MouseEvent
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from tkinter import ttk
+
+from blitmanager import BlitManager
+from clickerinteractions import ClickInteraction
+from hovertooltip import HoverTooltip
+from interactiveoverlays import WeatherOverlay
+from multichartdisplay import SynchronizedWeatherDashboard
+from smoothanimations import AnimatedWeatherChart
+from visualthemes import WeatherChartTheme
+from weatherdatastore import WeatherDataStore
+
+# The chart modules select TkAgg when imported, which needs a display
+import matplotlib.pyplot as plt
+plt.switch_backend('Agg')
+
+
+DEFAULT_SIZES = [10 ** k for k in range(2, 8)]
+BENCHMARKS = {}
+
+
+def benchmark(name, max_size=None):
+    """Register setup(size) -> op as a benchmark; op() is the timed call."""
+    def register(setup):
+        BENCHMARKS[name] = (setup, max_size)
+        return setup
+    return register
+
+
+# ----- Headless stand-ins -----
+class DeferredAggCanvas(FigureCanvasAgg):
+    """Agg canvas whose draw_idle is deferred like Tk's instead of drawing at once."""
+
+    def __init__(self, figure):
+        super().__init__(figure)
+        self.draw_requests = 0
+
+    def draw_idle(self, *args, **kwargs):
+        self.draw_requests += 1
+
+
+class _DetachedFrame(ttk.Frame):
+    """Stands in for ttk.Frame.__init__ so the dashboard needs no Tk root."""
+
+    def __init__(self, parent):
+        pass
+
+
+class HeadlessDashboard(SynchronizedWeatherDashboard, _DetachedFrame):
+    """SynchronizedWeatherDashboard on Agg canvases, with a manual idle queue."""
+
+    def __init__(self):
+        self.idle = []
+        super().__init__(None)
+
+    def after_idle(self, callback):
+        self.idle.append(callback)
+
+    def after(self, ms, callback):
+        self.idle.append(callback)
+
+    def run_idle(self):
+        """Run the queued idle callbacks, as Tk would between events."""
+        while self.idle:
+            self.idle.pop(0)()
+
+    def _create_layout(self):
+        for name in ('temperature', 'precipitation', 'wind', 'pressure'):
+            fig = Figure(figsize=(12, 3), dpi=100)
+            ax = fig.add_subplot(111)
+            if self.shared_x_axis is None:
+                self.shared_x_axis = ax
+            else:
+                ax.sharex(self.shared_x_axis)
+            canvas = DeferredAggCanvas(fig)
+
+            chart = {
+                'name': name,
+                'figure': fig,
+                'ax': ax,
+                'canvas': canvas,
+                'toolbar': None,
+                'data_lines': [],
+                'lod_series': {},
+                'overlays': WeatherOverlay(ax),
+                'tooltip': HoverTooltip(ax, canvas, use_blitting=True)
+            }
+            if name == 'wind':
+                chart['ax2'] = ax.twinx()
+            self.charts.append(chart)
+
+
+def make_weather_data(size, seed=0):
+    """Synthetic hourly weather data with every field the charts show."""
+    rng = np.random.default_rng(seed)
+    i = np.arange(size)
+    return WeatherDataStore({
+        'timestamps': 19000 + i / 24,
+        'temperature': 20 + np.sin(i / 10) * 5 + rng.uniform(-1, 1, size),
+        'feels_like': 19 + np.sin(i / 11) * 5,
+        'humidity': 60 + np.cos(i / 15) * 20,
+        'pressure': 1013 + np.sin(i / 30) * 3,
+        'precipitation': np.where(rng.random(size) < 0.3, rng.uniform(0, 3, size), 0),
+        'wind_speed': 5 + rng.uniform(0, 5, size),
+        'wind_direction': rng.uniform(0, 360, size)
+    })
+
+
+def mouse_events(ax, canvas, x, y, name='motion_notify_event', count=64, seed=0):
+    """Synthetic MouseEvents at data points picked from (x, y)."""
+    rng = np.random.default_rng(seed)
+    picks = rng.integers(0, len(x), count)
+    pixels = ax.transData.transform(np.column_stack([x[picks], y[picks]]))
+    return [MouseEvent(name, canvas, px, py, button=1 if name == 'button_press_event' else None)
+            for px, py in pixels]
+
+
+def line_figure(size):
+    """Figure with one temperature line of size points, drawn once."""
+    fig = Figure(figsize=(12, 4), dpi=100)
+    canvas = DeferredAggCanvas(fig)
+    ax = fig.add_subplot(111)
+    data = make_weather_data(size)
+    x, y = data['timestamps'], data['temperature']
+    line, = ax.plot(x, y)
+    canvas.draw()
+    return fig, canvas, ax, line, x, y
+
+
+def cycle(items):
+    """Callable returning the next item of items on each call, round-robin."""
+    position = [0]
+
+    def next_item():
+        item = items[position[0] % len(items)]
+        position[0] += 1
+        return item
+    return next_item
+
+
+# ----- Benchmarks -----
+@benchmark('hover_tooltip_update')
+def setup_hover(size):
+    fig, canvas, ax, line, x, y = line_figure(size)
+    tooltip = HoverTooltip(ax, canvas, use_blitting=True)
+    tooltip.add_line(line, 'Temperature')
+    canvas.draw()  # Cache the blitting background
+    next_event = cycle(mouse_events(ax, canvas, x, y))
+    return lambda: tooltip.update(next_event())
+
+
+@benchmark('click_handle_click')
+def setup_click(size):
+    fig, canvas, ax, line, x, y = line_figure(size)
+    clicker = ClickInteraction(ax, canvas)
+    lines_data = [{'x': x, 'y': y, 'label': 'Temperature'}]
+    next_event = cycle(mouse_events(ax, canvas, x, y, name='button_press_event'))
+    return lambda: clicker.handle_click(next_event(), lines_data)
+
+
+def animated_chart(size):
+    """AnimatedWeatherChart with size-sample buffers filled and blitting set up."""
+    fig = Figure(figsize=(12, 4), dpi=100)
+    canvas = DeferredAggCanvas(fig)
+    ax = fig.add_subplot(111)
+    chart = AnimatedWeatherChart(fig, ax, max_points=size)
+    chart.add_series('Temperature', color='orange')
+    chart.add_series('Humidity', color='blue')
+
+    # As start_animation does, without starting a timer
+    chart.blit_manager = BlitManager.for_canvas(canvas)
+    for line in chart.lines.values():
+        chart.blit_manager.add_artist(line)
+
+    data = make_weather_data(size)
+    chart.add_data_points(data['timestamps'], {
+        'Temperature': data['temperature'],
+        'Humidity': data['humidity']
+    })
+    chart._animate(0)
+    canvas.draw()
+    return chart, data['timestamps'][-1]
+
+
+@benchmark('animated_add_data_point')
+def setup_add_data_point(size):
+    chart, last = animated_chart(size)
+    step = 1 / 24
+    state = {'t': last}
+
+    def op():
+        state['t'] += step
+        chart.add_data_point(state['t'], {'Temperature': 20.0, 'Humidity': 55.0})
+    return op
+
+
+@benchmark('animated_frame')
+def setup_animate(size):
+    chart, last = animated_chart(size)
+    step = 1 / 24
+    state = {'t': last, 'frame': 0}
+
+    def op():
+        # One new sample per frame, as with a live feed
+        state['t'] += step
+        state['frame'] += 1
+        chart.add_data_point(state['t'], {'Temperature': 20.0, 'Humidity': 55.0})
+        chart._animate(state['frame'])
+    return op
+
+
+@benchmark('dashboard_update_data')
+def setup_update_data(size):
+    dashboard = HeadlessDashboard()
+    datasets = cycle([make_weather_data(size, seed=0), make_weather_data(size, seed=1)])
+    dashboard.update_data(datasets())
+    dashboard.run_idle()
+
+    def op():
+        dashboard.update_data(datasets())
+        dashboard.run_idle()
+    return op
+
+
+@benchmark('dashboard_xlim_cascade')
+def setup_xlim_cascade(size):
+    dashboard = HeadlessDashboard()
+    data = make_weather_data(size)
+    dashboard.update_data(data)
+    dashboard.run_idle()
+
+    # Zoom windows between a tenth and all of the data, on random charts
+    rng = np.random.default_rng(0)
+    t0, t1 = data['timestamps'][0], data['timestamps'][-1]
+    windows = []
+    for _ in range(64):
+        span = (t1 - t0) * rng.uniform(0.1, 1)
+        start = rng.uniform(t0, t1 - span)
+        windows.append((rng.integers(len(dashboard.charts)), start, start + span))
+    next_window = cycle(windows)
+
+    def op():
+        chart, start, end = next_window()
+        dashboard.charts[chart]['ax'].set_xlim(start, end)
+        dashboard.run_idle()
+    return op
+
+
+@benchmark('theme_apply')
+def setup_theme(size):
+    fig, canvas, ax, line, x, y = line_figure(size)
+    themes = cycle(list(WeatherChartTheme.THEMES))
+    return lambda: WeatherChartTheme.apply_theme(fig, ax, themes())
+
+
+@benchmark('transition_animation', max_size=10 ** 5)
+def setup_transition(size):
+    fig = Figure(figsize=(12, 4), dpi=100)
+    canvas = DeferredAggCanvas(fig)
+    ax = fig.add_subplot(111)
+    chart = AnimatedWeatherChart(fig, ax, max_points=size)
+    line = chart.add_series('Temperature')
+    old = make_weather_data(size, seed=0)
+    new = make_weather_data(size, seed=1)
+    line.set_data(old['timestamps'], old['temperature'])
+    old_data = {'Temperature': old['temperature']}
+    new_data = {'Temperature': new['temperature']}
+
+    def op():
+        # Build the transition and compute all of its frames
+        transition = chart.create_transition_animation(old_data, new_data)
+        for frame in range(30):
+            transition._func(frame)
+        transition.event_source.stop()
+    return op
+
+
+# ----- Runner -----
+def measure(op, repeat, budget):
+    """Time op() up to repeat times or budget seconds, after one warm-up call."""
+    op()
+    times = []
+    deadline = time.perf_counter() + budget
+    while len(times) < repeat and (len(times) < 3 or time.perf_counter() < deadline):
+        start = time.perf_counter_ns()
+        op()
+        times.append(time.perf_counter_ns() - start)
+
+    # Memory in a separate call, since tracing slows everything down
+    tracemalloc.start()
+    op()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    times = np.array(times) / 1e6
+    return {
+        'calls': len(times),
+        'median_ms': float(np.median(times)),
+        'p99_ms': float(np.percentile(times, 99)),
+        'min_ms': float(times.min()),
+        'peak_alloc_kib': peak / 1024
+    }
+
+
+def run(names, sizes, repeat, budget):
+    results = []
+    for name in names:
+        setup, max_size = BENCHMARKS[name]
+        for size in sizes:
+            if max_size is not None and size > max_size:
+                print(f"{name:28} {size:>10,}  skipped (max {max_size:,})")
+                continue
+
+            op = setup(size)
+            result = {'benchmark': name, 'size': size}
+            result.update(measure(op, repeat, budget))
+            result['max_rss_mib'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+            results.append(result)
+            print(f"{name:28} {size:>10,}  median {result['median_ms']:9.3f} ms  "
+                  f"p99 {result['p99_ms']:9.3f} ms  peak {result['peak_alloc_kib']:10.1f} KiB")
+            plt.close('all')
+    return results
+
+
+def compare(results, baseline_path, tolerance):
+    """Print median changes against a baseline file; return the regressions."""
+    with open(baseline_path, 'r') as f:
+        baseline = {(r['benchmark'], r['size']): r for r in json.load(f)['results']}
+
+    regressions = []
+    for result in results:
+        old = baseline.get((result['benchmark'], result['size']))
+        if old is None:
+            continue
+        ratio = result['median_ms'] / old['median_ms'] if old['median_ms'] else float('inf')
+        flag = ''
+        if ratio > 1 + tolerance:
+            regressions.append(result)
+            flag = '  REGRESSION'
+        print(f"{result['benchmark']:28} {result['size']:>10,}  {ratio:6.2f}x baseline{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--only', nargs='+', metavar='NAME',
+                        help='benchmarks whose name contains any of these')
+    parser.add_argument('--repeat', type=int, default=200, help='max timed calls per case')
+    parser.add_argument('--budget', type=float, default=2.0, help='seconds per case')
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--baseline', help='earlier results file to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='allowed median slowdown against the baseline')
+    args = parser.parse_args(argv)
+
+    names = [name for name in BENCHMARKS
+             if not args.only or any(part in name for part in args.only)]
+    results = run(names, args.sizes, args.repeat, args.budget)
+
+    with open(args.output, 'w') as f:
+        json.dump({
+            'meta': {
+                'date': datetime.now().isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'numpy': np.__version__,
+                'matplotlib': matplotlib.__version__,
+                'machine': platform.platform()
+            },
+            'results': results
+        }, f, indent=2)
+    print(f"Wrote {args.output}")
+
+    if args.baseline:
+        return 1 if compare(results, args.baseline, args.tolerance) else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
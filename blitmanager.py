@@ -0,0 +1,74 @@
+import weakref
+
+
+class BlitManager:
+    """Cache a canvas background and redraw only animated artists on top of it."""
+
+    # One manager per canvas so tooltips and crosshairs share a background
+    _managers = weakref.WeakKeyDictionary()
+
+    @classmethod
+    def for_canvas(cls, canvas):
+        """Get (or create) the blit manager attached to a canvas."""
+        manager = cls._managers.get(canvas)
+        if manager is None:
+            manager = cls(canvas)
+            cls._managers[canvas] = manager
+        return manager
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.background = None
+        self.artists = []
+        self.watched_callbacks = []
+
+        # Grab a fresh background after every full draw
+        self.draw_cid = canvas.mpl_connect('draw_event', self._on_draw)
+
+    def add_artist(self, artist):
+        """Register an artist that is redrawn by blitting instead of full draws."""
+        artist.set_animated(True)
+        if artist not in self.artists:
+            self.artists.append(artist)
+
+        # A limit change makes the cached background stale until the next full
+        # draw. ax.clear() replaces the callback registry, so track registries.
+        ax = artist.axes
+        if ax is not None and not any(cb is ax.callbacks for cb in self.watched_callbacks):
+            ax.callbacks.connect('xlim_changed', self.invalidate)
+            ax.callbacks.connect('ylim_changed', self.invalidate)
+            self.watched_callbacks.append(ax.callbacks)
+
+    def remove_artist(self, artist):
+        """Stop managing an artist."""
+        if artist in self.artists:
+            self.artists.remove(artist)
+
+    def invalidate(self, *args):
+        """Drop the cached background so the next update does a full draw."""
+        self.background = None
+
+    def _on_draw(self, event):
+        """Cache the background after a full draw and paint animated artists."""
+        self.background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self._draw_animated()
+
+    def _draw_animated(self):
+        """Draw all managed artists onto the canvas."""
+        # ax.clear() detaches artists, so forget any that no longer belong to an axes
+        self.artists = [artist for artist in self.artists if artist.axes is not None]
+
+        figure = self.canvas.figure
+        for artist in self.artists:
+            figure.draw_artist(artist)
+
+    def update(self):
+        """Restore the cached background, redraw animated artists and blit."""
+        if self.background is None:
+            # The next full draw will cache a new background
+            self.canvas.draw_idle()
+            return
+
+        self.canvas.restore_region(self.background)
+        self._draw_animated()
+        self.canvas.blit(self.canvas.figure.bbox)
@@ -1,22 +1,31 @@
-import tkinter as tk
-from tkinter import ttk
-import matplotlib
-matplotlib.use('TkAgg')  # Ensure we're using the Tkinter backend
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
-from matplotlib.figure import Figure
-import matplotlib.pyplot as plt
 import numpy as np
-from datetime import datetime, timedelta
-import json
+from rangestats import RangeStats
+
+def _buffer_key(values):
+    """Identify the memory an array views; store columns give a new view per lookup."""
+    values = np.asarray(values)
+    return values.__array_interface__['data'][0], values.shape, values.strides
 
 class ClickInteraction:
     def __init__(self, ax, canvas, callback=None):
         self.ax = ax
         self.canvas = canvas
         self.callback = callback
-        self.selected_points = []
-        self.selection_markers = []
+        
+        # (label, index) -> (x, y), in selection order
+        self.selected_points = {}
+        
+        # All selection markers are one scatter, created on first use.
+        # Each selected point owns a row of _marker_xy; the first
+        # len(selected_points) rows are the scatter's offsets.
+        self.marker_layer = None
+        self._marker_xy = np.empty((16, 2))
+        self._marker_slots = {}  # (label, index) -> row
+        self._slot_keys = []  # row -> (label, index)
         self.range_selector = None
+        
+        # Series label -> (data key, RangeStats) of the last lines_data, for range selections
+        self.range_stats = {}
         self.selection_mode = 'point'  # 'point' or 'range'
     
     def set_selection_mode(self, mode):
@@ -32,7 +41,7 @@ class ClickInteraction:
         if self.selection_mode == 'point':
             self._handle_point_selection(event, lines_data)
         elif self.selection_mode == 'range':
-            self._handle_range_selection(event)
+            self._handle_range_selection(event, lines_data)
     
     def _handle_point_selection(self, event, lines_data):
         """Handle selection of individual points."""
@@ -57,7 +66,7 @@ class ClickInteraction:
                 selected_point = {
                     'x': xdata[idx],
                     'y': ydata[idx],
-                    'index': idx,
+                    'index': int(idx),
                     'label': label,
                     'series': line_data
                 }
@@ -65,15 +74,15 @@ class ClickInteraction:
         # Select point if close enough
         if selected_point and min_distance < 0.05:
             # Toggle selection
-            point_key = (selected_point['x'], selected_point['y'], selected_point['label'])
+            point_key = (selected_point['label'], selected_point['index'])
             
             if point_key in self.selected_points:
                 # Deselect
-                self.selected_points.remove(point_key)
+                del self.selected_points[point_key]
                 self._remove_selection_marker(point_key)
             else:
                 # Select
-                self.selected_points.append(point_key)
+                self.selected_points[point_key] = (selected_point['x'], selected_point['y'])
                 self._add_selection_marker(selected_point)
             
             # Trigger callback
@@ -82,8 +91,10 @@ class ClickInteraction:
             
             self.canvas.draw_idle()
     
-    def _handle_range_selection(self, event):
+    def _handle_range_selection(self, event, lines_data):
         """Handle range selection with rectangle selector."""
+        self._update_range_stats(lines_data)
+        
         if self.range_selector is None:
             from matplotlib.widgets import RectangleSelector
             
@@ -98,11 +109,13 @@ class ClickInteraction:
                     if y1 > y2:
                         y1, y2 = y2, y1
                     
-                    # Trigger callback with selected range
+                    # Trigger callback with selected range and per-series statistics
                     if self.callback:
                         self.callback('range_selected', {
                             'x_range': (x1, x2),
-                            'y_range': (y1, y2)
+                            'y_range': (y1, y2),
+                            'series': {label: stats.window(x1, x2)
+                                       for label, (key, stats) in self.range_stats.items()}
                         })
             
             self.range_selector = RectangleSelector(
@@ -114,42 +127,69 @@ class ClickInteraction:
                 minspany=5,
                 spancoords='pixels',
                 interactive=True,
-                rectprops=dict(facecolor='blue', alpha=0.2)
+                props=dict(facecolor='blue', alpha=0.2)
             )
     
+    def _update_range_stats(self, lines_data):
+        """Build range statistics for series that are new or have new data."""
+        range_stats = {}
+        for line_data in lines_data:
+            label = line_data['label']
+            key = (_buffer_key(line_data['x']), _buffer_key(line_data['y']))
+            cached = self.range_stats.get(label)
+            if cached is not None and cached[0] == key:
+                range_stats[label] = cached
+            else:
+                range_stats[label] = (key, RangeStats(line_data['x'], line_data['y']))
+        self.range_stats = range_stats
+    
     def _add_selection_marker(self, point):
         """Add visual marker for selected point."""
-        marker = self.ax.scatter(
-            point['x'],
-            point['y'],
-            c='yellow',
-            s=150,
-            marker='*',
-            edgecolors='orange',
-            linewidths=2,
-            zorder=10
-        )
+        slot = len(self._slot_keys)
+        if slot == len(self._marker_xy):
+            self._marker_xy = np.concatenate([self._marker_xy, np.empty_like(self._marker_xy)])
+        
+        key = (point['label'], point['index'])
+        self._marker_xy[slot] = (point['x'], point['y'])
+        self._marker_slots[key] = slot
+        self._slot_keys.append(key)
         
-        self.selection_markers.append({
-            'marker': marker,
-            'key': (point['x'], point['y'], point['label'])
-        })
+        if self.marker_layer is None:
+            self.marker_layer = self.ax.scatter(
+                [point['x']],
+                [point['y']],
+                c='yellow',
+                s=150,
+                marker='*',
+                edgecolors='orange',
+                linewidths=2,
+                zorder=10
+            )
+        else:
+            self._update_marker_layer()
     
     def _remove_selection_marker(self, point_key):
         """Remove selection marker."""
-        for i, item in enumerate(self.selection_markers):
-            if item['key'] == point_key:
-                item['marker'].remove()
-                self.selection_markers.pop(i)
-                break
+        # Move the last marker into the freed row so the rows stay packed
+        slot = self._marker_slots.pop(point_key)
+        last_key = self._slot_keys.pop()
+        if last_key != point_key:
+            self._marker_xy[slot] = self._marker_xy[len(self._slot_keys)]
+            self._marker_slots[last_key] = slot
+            self._slot_keys[slot] = last_key
+        self._update_marker_layer()
+    
+    def _update_marker_layer(self):
+        """Point the marker scatter at the selected rows."""
+        self.marker_layer.set_offsets(self._marker_xy[:len(self._slot_keys)])
     
     def clear_selection(self):
         """Clear all selections."""
-        for item in self.selection_markers:
-            item['marker'].remove()
-        
-        self.selection_markers = []
-        self.selected_points = []
+        self.selected_points = {}
+        self._marker_slots = {}
+        self._slot_keys = []
+        if self.marker_layer is not None:
+            self._update_marker_layer()
         
         if self.range_selector:
             self.range_selector.set_active(False)
@@ -0,0 +1,165 @@
+import re
+from collections import OrderedDict
+
+import matplotlib
+import matplotlib.dates
+import matplotlib.ticker
+import numpy as np
+
+
+# strftime directives built from date parts: directive -> (part, str.format spec)
+_DIRECTIVES = {
+    'Y': ('year', '04d'),
+    'y': ('year2', '02d'),
+    'm': ('month', '02d'),
+    'd': ('day', '02d'),
+    'H': ('hour', '02d'),
+    'M': ('minute', '02d'),
+    'S': ('second', '02d')
+}
+
+_DIRECTIVE = re.compile(r'%(.)')
+
+
+def _template(fmt):
+    """Turn a strftime format into a str.format template, or None if unsupported."""
+    unsupported = False
+
+    def replace(match):
+        nonlocal unsupported
+        code = match.group(1)
+        if code == '%':
+            return '%'
+        if code not in _DIRECTIVES:
+            unsupported = True
+            return ''
+        part, spec = _DIRECTIVES[code]
+        return '{' + part + ':' + spec + '}'
+
+    template = _DIRECTIVE.sub(replace, fmt.replace('{', '{{').replace('}', '}}'))
+    return None if unsupported else template
+
+
+def _date_parts(values):
+    """Calendar parts of matplotlib date numbers (UTC), as int arrays."""
+    # Rounded to microseconds like num2date, then truncated by each part
+    values = np.asarray(values, dtype=float)
+    micros = np.round(values * 86400e6)
+    # num2date also rounds dates far from the epoch to 20 us
+    far = np.abs(values) > 70 * 365
+    micros[far] = np.round(micros[far] / 20) * 20
+    micros = micros.astype(np.int64)
+    dates = np.datetime64(matplotlib.dates.get_epoch(), 'us') + micros.astype('timedelta64[us]')
+
+    days = dates.astype('datetime64[D]')
+    months = dates.astype('datetime64[M]')
+    years = dates.astype('datetime64[Y]').astype(np.int64) + 1970
+    seconds = (dates - days).astype('timedelta64[s]').astype(np.int64)
+    return {
+        'year': years,
+        'year2': years % 100,
+        'month': months.astype(np.int64) % 12 + 1,
+        'day': (days - months.astype('datetime64[D]')).astype(np.int64) + 1,
+        'hour': seconds // 3600,
+        'minute': seconds // 60 % 60,
+        'second': seconds % 60
+    }
+
+
+class DateLabels:
+    """Labels of matplotlib date numbers in one strftime format, LRU-cached.
+
+    Misses are converted to calendar fields in one vectorized numpy pass
+    per batch and only assembled into strings per value. Formats using
+    directives other than %Y %y %m %d %H %M %S, or a timezone other than
+    UTC, fall back to num2date and strftime for each new label.
+    """
+
+    def __init__(self, fmt, maxsize=8192):
+        self.fmt = fmt
+        self.maxsize = maxsize
+        self.template = _template(fmt)
+        self.labels = OrderedDict()  # date number -> label
+
+    def __len__(self):
+        return len(self.labels)
+
+    def format(self, value):
+        """Label of one date number."""
+        value = float(value)
+        label = self.labels.get(value)
+        if label is None:
+            return self.format_many([value])[0]
+        self.labels.move_to_end(value)
+        return label
+
+    def format_at(self, timestamps, index, block=256):
+        """Label of timestamps[index]; a miss formats its whole block of neighbours.
+
+        Hovering along a series then hits the cache for nearby samples.
+        """
+        value = float(timestamps[index])
+        label = self.labels.get(value)
+        if label is not None:
+            self.labels.move_to_end(value)
+            return label
+        start = index - index % block
+        return self.format_many(timestamps[start:start + block])[index - start]
+
+    def format_many(self, values):
+        """Labels of a sequence of date numbers, formatting all misses together."""
+        values = [float(value) for value in values]
+        labels = self.labels
+        batch = {}
+        missing = []
+        for value in dict.fromkeys(values):
+            label = labels.get(value)
+            if label is None:
+                missing.append(value)
+            else:
+                labels.move_to_end(value)
+                batch[value] = label
+
+        if missing:
+            formatted = dict(zip(missing, self._format_batch(missing)))
+            batch.update(formatted)
+            labels.update(formatted)
+            while len(labels) > self.maxsize:
+                labels.popitem(last=False)
+        return [batch[value] for value in values]
+
+    def _format_batch(self, values):
+        """Format date numbers without the cache."""
+        if self.template is None or matplotlib.rcParams['timezone'] != 'UTC':
+            return [matplotlib.dates.num2date(value).strftime(self.fmt) for value in values]
+
+        parts = _date_parts(values)
+        names = list(parts)
+        columns = zip(*(parts[name].tolist() for name in names))
+        return [self.template.format(**dict(zip(names, row))) for row in columns]
+
+
+# One shared cache per format, used by tooltips, tick labels and exports
+_shared = {}
+
+
+def date_labels(fmt):
+    """The shared DateLabels for a strftime format."""
+    labels = _shared.get(fmt)
+    if labels is None:
+        labels = _shared[fmt] = DateLabels(fmt)
+    return labels
+
+
+class DateLabelFormatter(matplotlib.ticker.Formatter):
+    """Tick formatter drawing its labels from the shared DateLabels cache."""
+
+    def __init__(self, fmt):
+        self.labels = date_labels(fmt)
+
+    def __call__(self, x, pos=None):
+        return self.labels.format(x)
+
+    def format_ticks(self, values):
+        self.set_locs(values)
+        return self.labels.format_many(values)
@@ -0,0 +1,209 @@
+import numpy as np
+
+
+def minmax_downsample(x, y, n_buckets):
+    """Reduce (x, y) to the min and max point of each of n_buckets buckets.
+
+    Points keep their original order, so peaks and troughs survive and the
+    line looks the same as the full series at the target resolution. Series
+    that already have two points per bucket or fewer are returned unchanged.
+    """
+    n = len(x)
+    n_buckets = int(n_buckets)
+    if n_buckets < 1 or n <= 2 * n_buckets:
+        return x, y
+
+    # Equal-count buckets; weather series are sampled at a regular interval
+    size = n // n_buckets
+    usable = size * n_buckets
+    # NaN gaps never win a bucket that has values; a bucket of only NaN
+    # picks its first sample, which keeps the line broken across the gap
+    gaps = np.isnan(y)
+    lows = np.where(gaps, np.inf, y)
+    highs = np.where(gaps, -np.inf, y)
+    offsets = np.arange(n_buckets) * size
+
+    picks = [
+        [i for i in (0, n - 1) if not gaps[i]],
+        np.argmin(lows[:usable].reshape(n_buckets, size), axis=1) + offsets,
+        np.argmax(highs[:usable].reshape(n_buckets, size), axis=1) + offsets
+    ]
+
+    # Points left over after the last full bucket
+    if usable < n:
+        picks.append([usable + np.argmin(lows[usable:]), usable + np.argmax(highs[usable:])])
+
+    indices = np.unique(np.concatenate(picks).astype(np.intp))
+    return x[indices], y[indices]
+
+
+def visible_slice(x, xlim):
+    """Index slice of sorted x covering xlim, plus one point either side."""
+    lo = max(np.searchsorted(x, xlim[0], side='left') - 1, 0)
+    hi = min(np.searchsorted(x, xlim[1], side='right') + 1, len(x))
+    return slice(lo, hi)
+
+
+def _merge_pairs(positions, choose):
+    """Merge neighbouring buckets, keeping the position chosen from each pair.
+
+    An odd bucket out at the end is carried up on its own.
+    """
+    paired = len(positions) // 2 * 2
+    pairs = positions[:paired].reshape(-1, 2)
+    chosen = pairs[np.arange(len(pairs)), choose(pairs)]
+    return np.concatenate([chosen, positions[paired:]])
+
+
+def _sum_pairs(values):
+    """Sum neighbouring buckets, carrying an odd bucket out up on its own."""
+    paired = len(values) // 2 * 2
+    return np.concatenate([values[:paired].reshape(-1, 2).sum(axis=1), values[paired:]])
+
+
+def _write(buffer, start, values):
+    """Write values into buffer from index start on, returning the buffer.
+
+    A buffer that is too small is replaced by one of at least twice the
+    size, so repeated appends copy each element O(1) times on average.
+    """
+    end = start + len(values)
+    if end > len(buffer):
+        grown = np.empty(max(end, 2 * len(buffer)), dtype=buffer.dtype)
+        grown[:start] = buffer[:start]
+        buffer = grown
+    buffer[start:end] = values
+    return buffer
+
+
+class MinMaxPyramid:
+    """Level-of-detail pyramid of a series with min/max/mean per 2**k bucket.
+
+    Level k covers the series in buckets of 2**k points; bucket i spans
+    indices [i * 2**k, (i + 1) * 2**k). Levels store the positions of each
+    bucket's min and max point (so views keep real x values) and the bucket
+    sums and counts for means. Building is O(n) once per dataset, appending
+    only recomputes the buckets the new samples fall in, and a view is
+    O(pixel width).
+    """
+
+    def __init__(self, x, y):
+        # Reference the given arrays (e.g. WeatherDataStore columns) as-is;
+        # they are only copied into growable buffers on the first extend
+        self._x = np.asarray(x, dtype=float)
+        self._y = np.asarray(y, dtype=float)
+        self.x = self._x
+        self.y = self._y
+        
+        # Per level: a buffer with spare capacity and the view in use
+        self._buffers = {name: [] for name in ('argmin', 'argmax', 'sums', 'counts')}
+        self.argmin = []
+        self.argmax = []
+        self.sums = []
+        self.counts = []
+        self._update_levels(0)
+
+    def __len__(self):
+        return len(self.y)
+
+    def extend(self, x, y):
+        """Append samples and update the buckets they fall in."""
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        if len(y) == 0:
+            return
+
+        old = len(self.y)
+        self._x = _write(self._x, old, x)
+        self._y = _write(self._y, old, y)
+        self.x = self._x[:old + len(x)]
+        self.y = self._y[:old + len(y)]
+        self._update_levels(old)
+
+    def _set_level(self, level, first, argmin, argmax, sums, counts):
+        """Replace a level's buckets from index first on."""
+        for name, values in (('argmin', argmin), ('argmax', argmax), ('sums', sums), ('counts', counts)):
+            buffers = self._buffers[name]
+            views = getattr(self, name)
+            if level == len(buffers):
+                buffers.append(np.empty(0, dtype=values.dtype))
+                views.append(None)
+            buffers[level] = _write(buffers[level], first, values)
+            views[level] = buffers[level][:first + len(values)]
+
+    def _update_levels(self, old):
+        """Recompute every level from sample index old onwards."""
+        y = self.y[old:]
+        positions = np.arange(old, len(self.y))
+        self._set_level(0, old, positions, positions, np.nan_to_num(y), (~np.isnan(y)).astype(float))
+
+        # Pair up the buckets of the level below, starting from the first
+        # bucket the new samples touch
+        level, first = 1, old
+        while len(self.argmin[level - 1]) > 1:
+            first >>= 1
+            below = slice(2 * first, None)
+
+            self._set_level(
+                level, first,
+                _merge_pairs(self.argmin[level - 1][below],
+                             lambda pairs: np.argmin(self._lows(pairs), axis=1)),
+                _merge_pairs(self.argmax[level - 1][below],
+                             lambda pairs: np.argmax(self._highs(pairs), axis=1)),
+                _sum_pairs(self.sums[level - 1][below]),
+                _sum_pairs(self.counts[level - 1][below])
+            )
+            level += 1
+
+    def _lows(self, positions):
+        """Values at positions, with NaN gaps never winning a min."""
+        values = self.y[positions]
+        return np.where(np.isnan(values), np.inf, values)
+
+    def _highs(self, positions):
+        """Values at positions, with NaN gaps never winning a max."""
+        values = self.y[positions]
+        return np.where(np.isnan(values), -np.inf, values)
+
+    def mean(self, level):
+        """Mean of each bucket at a level (NaN for all-gap buckets)."""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self.sums[level] / self.counts[level]
+
+    def level_for(self, count, width):
+        """Coarsest-needed level that draws count points in about 2 per pixel."""
+        if width < 1 or count <= 2 * width:
+            return 0
+        level = int(np.ceil(np.log2(count / width)))
+        return min(level, len(self.argmin) - 1)
+
+    def _window(self, xlim, width):
+        """Sample index range lo..hi-1 covering xlim, and the level to draw it at."""
+        if xlim is None:
+            lo, hi = 0, len(self.x)
+        else:
+            window = visible_slice(self.x, xlim)
+            lo, hi = window.start, window.stop
+        return lo, hi, self.level_for(hi - lo, width)
+
+    def view(self, xlim=None, width=1000):
+        """Return (x, y) for the window xlim at a level matching width pixels."""
+        lo, hi, level = self._window(xlim, width)
+        if level == 0:
+            return self.x[lo:hi], self.y[lo:hi]
+
+        first, last = lo >> level, ((hi - 1) >> level) + 1
+        indices = np.unique(np.concatenate([
+            self.argmin[level][first:last],
+            self.argmax[level][first:last]
+        ]))
+        return self.x[indices], self.y[indices]
+
+    def peaks(self, xlim=None, width=1000):
+        """Like view(), but only the largest sample of each bucket, e.g. for bars."""
+        lo, hi, level = self._window(xlim, width)
+        if level == 0:
+            return self.x[lo:hi], self.y[lo:hi]
+
+        indices = self.argmax[level][lo >> level:((hi - 1) >> level) + 1]
+        return self.x[indices], self.y[indices]
@@ -1,18 +1,39 @@
-import tkinter as tk
-from tkinter import ttk
-import matplotlib
-matplotlib.use('TkAgg')  # Ensure we're using the Tkinter backend
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
-from matplotlib.figure import Figure
-import matplotlib.pyplot as plt
 import numpy as np
-from datetime import datetime, timedelta
-import json
+from blitmanager import BlitManager
+from datelabels import date_labels
 
 
 
+class DataCursor:
+    """Values of several series at the sample nearest a hovered time.
+    
+    All series share one sorted timestamp array, so a lookup is a single
+    binary search followed by one read per series.
+    """
+    
+    def __init__(self):
+        self.timestamps = np.empty(0)
+        self.series = []  # (label, values) aligned with timestamps
+    
+    def set_data(self, timestamps, series):
+        """Point the cursor at timestamps and (label, values) pairs."""
+        self.timestamps = np.asarray(timestamps, dtype=float)
+        self.series = list(series)
+    
+    def lookup(self, x):
+        """Return (index, timestamp, [(label, value)]) nearest x, or None outside the data."""
+        timestamps = self.timestamps
+        if len(timestamps) == 0 or not timestamps[0] <= x <= timestamps[-1]:
+            return None
+        
+        i = int(np.searchsorted(timestamps, x))
+        if i == len(timestamps) or (i > 0 and x - timestamps[i - 1] < timestamps[i] - x):
+            i -= 1
+        return i, timestamps[i], [(label, float(values[i])) for label, values in self.series]
+
+
 class HoverTooltip:
-    def __init__(self, ax, canvas):
+    def __init__(self, ax, canvas, use_blitting=False):
         self.ax = ax
         self.canvas = canvas
         self.annotation = self.ax.annotate(
@@ -27,55 +48,143 @@ class HoverTooltip:
         )
         self.lines = []
         self.labels = []
+        self.indexes = []
+        self.threshold = 0.05  # Threshold in data units
+        
+        # A DataCursor replaces nearest-point snapping when set
+        self.data_cursor = None
+        
+        # Blit the annotation over a cached background instead of full redraws
+        self.blit_manager = None
+        if use_blitting:
+            self.blit_manager = BlitManager.for_canvas(canvas)
+            self.blit_manager.add_artist(self.annotation)
     
     def add_line(self, line, label):
         """Add a line to monitor for hover events."""
         self.lines.append(line)
         self.labels.append(label)
+        self.indexes.append(self._build_index(line))
+    
+    def remove_line(self, line):
+        """Stop monitoring a line."""
+        if line in self.lines:
+            i = self.lines.index(line)
+            del self.lines[i], self.labels[i], self.indexes[i]
+    
+    def refresh_index(self, line=None):
+        """Rebuild the lookup index after a line's data was modified in place."""
+        for i, monitored in enumerate(self.lines):
+            if line is None or monitored is line:
+                self.indexes[i] = self._build_index(monitored)
+    
+    def set_data_cursor(self, cursor):
+        """Show every series of a DataCursor at the hovered time; None snaps to points again."""
+        self.data_cursor = cursor
+    
+    def _build_index(self, line):
+        """Build a sorted-x index over a line's data for fast hover lookups."""
+        xdata = line.get_xdata()
+        ydata = line.get_ydata()
+        x = np.asarray(xdata, dtype=float)
+        y = np.asarray(ydata, dtype=float)
+        positions = np.arange(len(x))
+        
+        # Drop points that can never be hovered (NaN gaps, infinities)
+        finite = np.isfinite(x) & np.isfinite(y)
+        if not finite.all():
+            x, y, positions = x[finite], y[finite], positions[finite]
+        
+        # Time series are normally sorted already, so only sort when needed
+        if len(x) > 1 and np.any(x[1:] < x[:-1]):
+            order = np.argsort(x, kind='stable')
+            x, y, positions = x[order], y[order], positions[order]
+        
+        return {
+            'xdata': xdata,
+            'ydata': ydata,
+            'x': x,
+            'y': y,
+            'positions': positions
+        }
+    
+    def _get_index(self, i):
+        """Return the index for line i, rebuilding it if the line data changed."""
+        line = self.lines[i]
+        index = self.indexes[i]
+        # set_data/set_xdata/set_ydata replace the stored sequences, so an
+        # identity check is enough to notice new data without scanning it
+        if line.get_xdata() is not index['xdata'] or line.get_ydata() is not index['ydata']:
+            index = self._build_index(line)
+            self.indexes[i] = index
+        return index
+    
+    def _nearest_in_index(self, index, x, y):
+        """Find the nearest indexed point to (x, y) within the threshold."""
+        xs = index['x']
+        
+        # Only points within the threshold along x can be close enough, so
+        # binary search for that window instead of scanning every point
+        lo = np.searchsorted(xs, x - self.threshold, side='left')
+        hi = np.searchsorted(xs, x + self.threshold, side='right')
+        if lo >= hi:
+            return None
+        
+        distances = np.hypot(xs[lo:hi] - x, index['y'][lo:hi] - y)
+        i = int(np.argmin(distances))
+        return distances[i], lo + i
     
-    def update(self, event):
+    def update(self, event, redraw=True):
         """Update tooltip based on mouse position."""
+        was_visible = self.annotation.get_visible()
+        
         if event.inaxes != self.ax:
             self.annotation.set_visible(False)
-            self.canvas.draw_idle()
+            if redraw and was_visible:
+                self.redraw()
             return
         
+        if self.data_cursor is not None:
+            self._show_cursor_values(event)
+        else:
+            self._show_nearest_point(event)
+        
+        # Nothing to repaint if the tooltip stayed hidden
+        if redraw and (was_visible or self.annotation.get_visible()):
+            self.redraw()
+    
+    def _show_nearest_point(self, event):
+        """Annotate the nearest point of any monitored line within the threshold."""
         # Find the nearest point on any line
         min_distance = float('inf')
         nearest_point = None
         nearest_label = None
         
-        for line, label in zip(self.lines, self.labels):
-            xdata = line.get_xdata()
-            ydata = line.get_ydata()
-            
-            if len(xdata) == 0:
-                continue
-            
-            # Convert display coordinates to data coordinates
-            points = np.column_stack([xdata, ydata])
-            
-            # Find nearest point
-            if event.xdata is not None and event.ydata is not None:
-                distances = np.sqrt((points[:, 0] - event.xdata)**2 + 
-                                  (points[:, 1] - event.ydata)**2)
-                idx = np.argmin(distances)
-                distance = distances[idx]
+        if event.xdata is not None and event.ydata is not None:
+            for i, label in enumerate(self.labels):
+                index = self._get_index(i)
+                
+                if len(index['x']) == 0:
+                    continue
                 
+                found = self._nearest_in_index(index, event.xdata, event.ydata)
+                if found is None:
+                    continue
+                
+                distance, pos = found
                 if distance < min_distance:
                     min_distance = distance
-                    nearest_point = (xdata[idx], ydata[idx], idx)
+                    nearest_point = (index['x'][pos], index['y'][pos], index['positions'][pos])
                     nearest_label = label
         
         # Update annotation if close enough to a point
-        if nearest_point and min_distance < 0.05:  # Threshold in data units
+        if nearest_point and min_distance < self.threshold:
             x, y, idx = nearest_point
             
             # Format the tooltip text
             if isinstance(x, (int, float)):
                 # Assume x is matplotlib date number
-                date = matplotlib.dates.num2date(x)
-                date_str = date.strftime('%Y-%m-%d %H:%M')
+                date_str = date_labels('%Y-%m-%d %H:%M').format(x)
             else:
                 date_str = str(x)
             
@@ -90,8 +199,34 @@ class HoverTooltip:
             self._adjust_annotation_position()
         else:
             self.annotation.set_visible(False)
+    
+    def _show_cursor_values(self, event):
+        """Annotate the values of all cursor series at the hovered time."""
+        found = None if event.xdata is None else self.data_cursor.lookup(event.xdata)
+        if found is None:
+            self.annotation.set_visible(False)
+            return
+        
+        i, x, values = found
+        date_str = date_labels('%Y-%m-%d %H:%M').format_at(self.data_cursor.timestamps, i)
+        rows = [f'{label}: {value:.2f}' if np.isfinite(value) else f'{label}: -'
+                for label, value in values]
         
-        self.canvas.draw_idle()
+        # Point at this chart's own series where it has a value there
+        y = next((value for label, value in values
+                  if label in self.labels and np.isfinite(value)), event.ydata)
+        
+        self.annotation.xy = (x, y)
+        self.annotation.set_text('\n'.join([date_str] + rows))
+        self.annotation.set_visible(True)
+        self._adjust_annotation_position()
+    
+    def redraw(self):
+        """Repaint the tooltip, blitting when enabled."""
+        if self.blit_manager is not None:
+            self.blit_manager.update()
+        else:
+            self.canvas.draw_idle()
     
     def _adjust_annotation_position(self):
         try:
@@ -1,19 +1,15 @@
-import tkinter as tk
-from tkinter import ttk
-import matplotlib
-matplotlib.use('TkAgg')  # Ensure we're using the Tkinter backend
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
-from matplotlib.figure import Figure
-import matplotlib.pyplot as plt
+import matplotlib.dates
 import numpy as np
-from datetime import datetime, timedelta
-import json
+from datetime import datetime
 
 
 class WeatherOverlay:
     def __init__(self, ax):
         self.ax = ax
         self.overlays = []
+        
+        # All anomaly markers share one scatter, created on first use
+        self.anomaly_markers = None
     
     def add_temperature_threshold(self, threshold, label, color='red', alpha=0.2):
         """Add a horizontal line showing temperature threshold."""
@@ -75,18 +71,18 @@ class WeatherOverlay:
         return span, text
     
     def add_anomaly_markers(self, times, values, labels=None):
-        """Mark anomalous data points."""
-        scatter = self.ax.scatter(
-            times,
-            values,
-            c='red',
-            s=100,
-            marker='o',
-            edgecolors='darkred',
-            linewidths=2,
-            label='Anomalies',
-            zorder=5
-        )
+        """Mark anomalous data points, adding them to the shared marker scatter."""
+        times = self._date_numbers(times)
+        values = np.asarray(values, dtype=float)
+        
+        if self.anomaly_markers is None:
+            self.set_anomaly_markers(times, values)
+        else:
+            self.anomaly_markers.set_offsets(np.concatenate([
+                self.anomaly_markers.get_offsets(),
+                np.column_stack([times, values])
+            ]))
+        scatter = self.anomaly_markers
         
         # Add labels if provided
         texts = []
@@ -103,10 +99,35 @@ class WeatherOverlay:
                 )
                 texts.append(text)
         
-        self.overlays.append(scatter)
         self.overlays.extend(texts)
         return scatter, texts
     
+    def set_anomaly_markers(self, times, values):
+        """Replace all anomaly markers, updating the marker scatter in place."""
+        offsets = np.column_stack([self._date_numbers(times), np.asarray(values, dtype=float)])
+        if self.anomaly_markers is None:
+            self.anomaly_markers = self.ax.scatter(
+                offsets[:, 0],
+                offsets[:, 1],
+                c='red',
+                s=100,
+                marker='o',
+                edgecolors='darkred',
+                linewidths=2,
+                label='Anomalies',
+                zorder=5
+            )
+            self.overlays.append(self.anomaly_markers)
+        else:
+            self.anomaly_markers.set_offsets(offsets)
+        return self.anomaly_markers
+    
+    def _date_numbers(self, times):
+        """Times as matplotlib date numbers."""
+        if len(times) and isinstance(times[0], datetime):
+            return matplotlib.dates.date2num(times)
+        return np.asarray(times, dtype=float)
+    
     def add_trend_line(self, x_data, y_data, label='Trend', color='green', linewidth=2):
         """Add a trend line using linear regression."""
         # Convert dates to numbers for regression
@@ -134,3 +155,4 @@ class WeatherOverlay:
         for overlay in self.overlays:
             overlay.remove()
         self.overlays = []
+        self.anomaly_markers = None
@@ -0,0 +1,117 @@
+import threading
+import time
+from collections import deque
+
+
+class SampleQueue:
+    """Bounded queue of (timestamp, data_dict) samples between threads.
+
+    Producers on any thread call put(); the Tk thread calls drain() once
+    per frame. deque appends and pops are atomic, so neither side takes a
+    lock. When the queue is full the oldest samples are dropped, which is
+    what a live view wants when it falls behind.
+    """
+
+    def __init__(self, maxsize=65536):
+        self.samples = deque(maxlen=maxsize)
+        self.dropped = 0
+
+    def __len__(self):
+        return len(self.samples)
+
+    def put(self, timestamp, data_dict):
+        """Queue one sample."""
+        if len(self.samples) == self.samples.maxlen:
+            self.dropped += 1
+        self.samples.append((timestamp, data_dict))
+
+    def drain(self, limit=None):
+        """Remove and return up to limit queued samples, oldest first."""
+        count = len(self.samples) if limit is None else min(limit, len(self.samples))
+        popleft = self.samples.popleft
+        return [popleft() for _ in range(count)]
+
+
+def polled(fetch, interval):
+    """Turn a blocking fetch() -> (timestamp, data_dict) into a sample iterator.
+
+    fetch is called every interval seconds; a slow fetch just delays the
+    next sample, never the GUI.
+    """
+    while True:
+        started = time.monotonic()
+        yield fetch()
+        time.sleep(max(interval - (time.monotonic() - started), 0))
+
+
+class ThreadedFeed:
+    """Run a sample source on a daemon thread, pushing into a SampleQueue.
+
+    source is an iterable of (timestamp, data_dict) samples, e.g. a
+    generator reading a socket or polled(fetch, interval).
+    """
+
+    def __init__(self, source, sample_queue, name='weather-feed'):
+        self.source = source
+        self.queue = sample_queue
+        self.name = name
+        self.error = None
+        self._stopped = threading.Event()
+        self._running = threading.Event()
+        self._running.set()
+        self._thread = None
+
+    def start(self):
+        """Start the producer thread."""
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Ask the producer to stop after its current sample."""
+        self._stopped.set()
+        self._running.set()
+
+    def pause(self):
+        """Stop pulling samples from the source until resume()."""
+        self._running.clear()
+
+    def resume(self):
+        self._running.set()
+
+    def _run(self):
+        try:
+            samples = iter(self.source)
+            while True:
+                # A paused feed blocks here instead of polling its source
+                self._running.wait()
+                if self._stopped.is_set():
+                    return
+                timestamp, data_dict = next(samples)
+                self.queue.put(timestamp, data_dict)
+        except StopIteration:
+            pass
+        except Exception as error:
+            # Surfaced to the GUI through feed.error; the thread just ends
+            self.error = error
+
+
+class AsyncioFeed(ThreadedFeed):
+    """Run an async iterator of samples on its own asyncio loop thread."""
+
+    def _run(self):
+        # Imported here so apps without async sources don't pay for asyncio
+        import asyncio
+        asyncio.run(self._consume())
+
+    async def _consume(self):
+        import asyncio
+        try:
+            async for timestamp, data_dict in self.source:
+                if not self._running.is_set():
+                    await asyncio.to_thread(self._running.wait)
+                if self._stopped.is_set():
+                    return
+                self.queue.put(timestamp, data_dict)
+        except Exception as error:
+            self.error = error
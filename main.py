@@ -2,26 +2,24 @@ import tkinter as tk
 from tkinter import ttk
 import matplotlib
 matplotlib.use('TkAgg')
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
-from matplotlib.figure import Figure
-import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 import numpy as np
 from datetime import datetime, timedelta
 import random
-from clickerinteractions import ClickInteraction
-from hovertooltip import HoverTooltip
-from interactiveoverlays import WeatherOverlay
-from matplotlibenvi import InteractiveWeatherChart
+import sys
 from multichartdisplay import SynchronizedWeatherDashboard
-from smoothanimations import AnimatedWeatherChart
-from visualthemes import WeatherChartTheme
+from weatherdatastore import WeatherDataStore
+
+# The other tabs' modules are imported when their tab is first shown
 
 
 class DummyPreferenceManager:
     def __init__(self):
         self.preferences = {
-            'display': {'theme': 'dark'}  # 'light', 'seaborn', 'minimalist'
+            'display': {
+                'theme': 'dark',  # 'light', 'seaborn', 'minimalist'
+                'render_cache_mb': 64  # Rendered chart views kept for reuse
+            }
         }
 
     def get(self, category, key, default=None):
@@ -31,48 +29,85 @@ class DummyPreferenceManager:
 def generate_sample_weather_data(n=120):
     now = datetime.now()
     timestamps = [now - timedelta(hours=i) for i in reversed(range(n))]
-    return {
+    i = np.arange(n)
+    return WeatherDataStore({
         'timestamps': mdates.date2num(timestamps),
-        'temperature': [20 + np.sin(i / 10) * 5 + random.uniform(-1, 1) for i in range(n)],
-        'humidity': [50 + np.cos(i / 15) * 10 + random.uniform(-2, 2) for i in range(n)],
-        'pressure': [1013 + np.sin(i / 30) * 3 + random.uniform(-0.5, 0.5) for i in range(n)],
-        'precipitation': [random.uniform(0, 3) if random.random() < 0.3 else 0 for _ in range(n)],
-        'wind_speed': [5 + random.uniform(0, 5) for _ in range(n)],
-        'wind_direction': [random.uniform(0, 360) for _ in range(n)],
-        'feels_like': [19 + np.sin(i / 11) * 5 for i in range(n)]
-    }
+        'temperature': 20 + np.sin(i / 10) * 5 + np.random.uniform(-1, 1, n),
+        'humidity': 50 + np.cos(i / 15) * 10 + np.random.uniform(-2, 2, n),
+        'pressure': 1013 + np.sin(i / 30) * 3 + np.random.uniform(-0.5, 0.5, n),
+        'precipitation': np.where(np.random.random(n) < 0.3, np.random.uniform(0, 3, n), 0),
+        'wind_speed': 5 + np.random.uniform(0, 5, n),
+        'wind_direction': np.random.uniform(0, 360, n),
+        'feels_like': 19 + np.sin(i / 11) * 5
+    })
 
 # ----- Main Application -----
 class WeatherApp(tk.Tk):
-    def __init__(self):
+    def __init__(self, data_path=None):
         super().__init__()
         self.title("Weather Visualizer Pro")
         self.geometry("1280x900")
         self.pref_manager = DummyPreferenceManager()
 
-        # Create notebook tabs
-        tabs = ttk.Notebook(self)
-        tabs.pack(fill=tk.BOTH, expand=True)
+        # Create notebook tabs; each is built the first time it is selected
+        self.tabs = ttk.Notebook(self)
+        self.tabs.pack(fill=tk.BOTH, expand=True)
+        self.tab_builders = {}
+        self.tab_visibility = {}  # tab -> callback(visible) for running work
+        self.current_tab = None
 
         # Tab 1: Synchronized dashboard
-        dashboard = SynchronizedWeatherDashboard(tabs, preference_manager=self.pref_manager)
-        tabs.add(dashboard, text="Dashboard")
+        self._add_tab("Dashboard", lambda parent: self._init_dashboard(parent, data_path))
 
         # Tab 2: Animated live chart
-        animated_tab = ttk.Frame(tabs)
-        tabs.add(animated_tab, text="Live Animation")
-        self._init_animated_chart(animated_tab)
+        self._add_tab("Live Animation", self._init_animated_chart)
 
         # Tab 3: Interactive chart
-        interactive_tab = ttk.Frame(tabs)
-        tabs.add(interactive_tab, text="Interactive Chart")
-        self._init_interactive_chart(interactive_tab)
-
-        # Load static data for dashboard
-        weather_data = generate_sample_weather_data(120)
-        dashboard.update_data(weather_data)
+        self._add_tab("Interactive Chart", self._init_interactive_chart)
+
+        self.tabs.bind('<<NotebookTabChanged>>', self._on_tab_changed)
+        self._on_tab_changed()
+
+    def _add_tab(self, text, build):
+        """Add an empty tab whose contents are built by build(frame) on first selection."""
+        frame = ttk.Frame(self.tabs)
+        self.tabs.add(frame, text=text)
+        self.tab_builders[str(frame)] = (frame, build)
+
+    def _on_tab_changed(self, event=None):
+        """Build the selected tab if needed, and pause work in the hidden one."""
+        selected = self.tabs.select()
+        if selected == self.current_tab:
+            return
+
+        if self.current_tab in self.tab_visibility:
+            self.tab_visibility[self.current_tab](False)
+        self.current_tab = selected
+
+        if selected in self.tab_builders:
+            frame, build = self.tab_builders.pop(selected)
+            build(frame)
+        elif selected in self.tab_visibility:
+            self.tab_visibility[selected](True)
+
+    def _init_dashboard(self, parent, data_path):
+        dashboard = SynchronizedWeatherDashboard(parent, preference_manager=self.pref_manager)
+        dashboard.pack(fill=tk.BOTH, expand=True)
+
+        # Stream a station export into the dashboard, or show sample data
+        if data_path:
+            dashboard.load_file(data_path)
+        else:
+            weather_data = generate_sample_weather_data(120)
+            dashboard.update_data(weather_data)
 
     def _init_animated_chart(self, parent):
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+        from matplotlib.figure import Figure
+        from anomalydetector import AnomalyDetector
+        from livefeed import SampleQueue, ThreadedFeed, polled
+        from smoothanimations import AnimatedWeatherChart
+
         fig = Figure(figsize=(12, 4), dpi=100)
         ax = fig.add_subplot(111)
         canvas = FigureCanvasTkAgg(fig, parent)
@@ -82,28 +117,44 @@ class WeatherApp(tk.Tk):
         animated = AnimatedWeatherChart(fig, ax)
         animated.add_series("Temperature", color='orange')
         animated.add_series("Humidity", color='blue')
+        animated.attach_anomaly_detector(AnomalyDetector(["Temperature", "Humidity"]))
         animated.start_animation(update_interval=1000)
 
-        def stream_data():
+        # Samples are produced on a worker thread and drained by the animation
+        def read_sensors():
             now = mdates.date2num(datetime.now())
-            animated.add_data_point(now, {
+            return now, {
                 "Temperature": 20 + random.uniform(-2, 2),
                 "Humidity": 50 + random.uniform(-5, 5)
-            })
-            self.after(1000, stream_data)
+            }
 
-        stream_data()
+        feed_queue = SampleQueue()
+        animated.attach_feed(feed_queue)
+        self.feed = ThreadedFeed(polled(read_sensors, interval=1.0), feed_queue).start()
+
+        # Stop animating and reading the sensor while the tab is hidden
+        def set_visible(visible):
+            if visible:
+                self.feed.resume()
+                animated.resume()
+            else:
+                self.feed.pause()
+                animated.pause()
+
+        self.tab_visibility[str(parent)] = set_visible
 
     def _init_interactive_chart(self, parent):
+        from clickerinteractions import ClickInteraction
+        from hovertooltip import HoverTooltip
+        from interactiveoverlays import WeatherOverlay
+        from matplotlibenvi import InteractiveWeatherChart
+
         chart = InteractiveWeatherChart(parent, preference_manager=self.pref_manager)
         chart.pack(fill=tk.BOTH, expand=True)
 
         # Load sample data
         data = generate_sample_weather_data(120)
-        chart.data['timestamps'] = data['timestamps']
-        chart.data['temperature'] = data['temperature']
-        chart.data['humidity'] = data['humidity']
-        chart.data['pressure'] = data['pressure']
+        chart.data = data
         chart.plot_data()  # You need to implement this method to draw initial lines
 
         # Example overlays
@@ -117,10 +168,10 @@ class WeatherApp(tk.Tk):
         tooltip.add_line(line, 'Temperature')
         clicker = ClickInteraction(chart.ax, chart.canvas, callback=lambda evt, data: print(f"{evt}: {data}"))
         chart.canvas.mpl_connect("button_press_event", lambda e: clicker.handle_click(e, [
-            {'x': np.array(data['timestamps']), 'y': np.array(data['temperature']), 'label': 'Temp'}
+            {'x': data['timestamps'], 'y': data['temperature'], 'label': 'Temp'}
         ]))
 
 # ----- Run App -----
 if __name__ == "__main__":
-    app = WeatherApp()
+    app = WeatherApp(sys.argv[1] if len(sys.argv) > 1 else None)
     app.mainloop()
\ No newline at end of file
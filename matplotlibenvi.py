@@ -4,10 +4,11 @@ import matplotlib
 matplotlib.use('TkAgg')  # Ensure we're using the Tkinter backend
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
 from matplotlib.figure import Figure
-import matplotlib.pyplot as plt
+import matplotlib.style
 import numpy as np
-from datetime import datetime, timedelta
-import json
+from downsampling import minmax_downsample, visible_slice
+from interactiveoverlays import WeatherOverlay
+from weatherdatastore import WeatherDataStore
 
 class InteractiveWeatherChart(ttk.Frame):
     def __init__(self, parent, preference_manager=None):
@@ -27,18 +28,25 @@ class InteractiveWeatherChart(ttk.Frame):
         self.toolbar.update()
         
         # Initialize data storage
-        self.data = {
+        self.data = WeatherDataStore({
             'timestamps': [],
             'temperature': [],
             'humidity': [],
             'pressure': []
-        }
+        })
         
         # Initialize interactive elements
         self.annotation = None
         self.hover_line = None
         self.selected_points = []
         
+        # (line, field, x, y): full-resolution data behind each plotted
+        # (decimated) line
+        self.plotted_series = []
+        
+        # Markers from mark_anomalies(), created on first use
+        self.anomaly_overlay = None
+        
         # Connect event handlers
         self._connect_events()
         
@@ -68,18 +76,49 @@ class InteractiveWeatherChart(ttk.Frame):
         pass
 
     def _on_resize(self, event):
+        # A different width needs a different number of points per series
+        self._redecimate()
+        self.canvas.draw_idle()
+    
+    def _on_xlim_changed(self, ax):
+        """Re-decimate so zooming in reveals full detail."""
+        self._redecimate()
         self.canvas.draw_idle()
     
+    def _decimate(self, x, y, xlim=None):
+        """Reduce a series to a couple of points per pixel column of the view."""
+        if xlim is not None:
+            window = visible_slice(x, xlim)
+            x, y = x[window], y[window]
+        
+        width = self.ax.get_window_extent().width
+        return minmax_downsample(x, y, width)
+    
+    def _redecimate(self):
+        """Refresh the plotted lines for the current view."""
+        xlim = self.ax.get_xlim()
+        for line, field, x, y in self.plotted_series:
+            line.set_data(*self._decimate(x, y, xlim))
+    
+    def _plot_series(self, field, x, y, **kwargs):
+        """Plot a decimated series and remember its full-resolution data."""
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        xlim = None if self.ax.get_autoscalex_on() else self.ax.get_xlim()
+        line = self.ax.plot(*self._decimate(x, y, xlim), **kwargs)[0]
+        self.plotted_series.append((line, field, x, y))
+        return line
+    
     def _apply_styling(self):
         """Apply styling based on preferences."""
         if self.pref_manager:
             theme = self.pref_manager.get('display', 'theme', 'light')
             if theme == 'dark':
-                plt.style.use('dark_background')
+                matplotlib.style.use('dark_background')
                 self.figure.patch.set_facecolor('#1E1E1E')
                 self.ax.set_facecolor('#2D2D2D')
             else:
-                plt.style.use('seaborn-v0_8-whitegrid')
+                matplotlib.style.use('seaborn-v0_8-whitegrid')
                 self.figure.patch.set_facecolor('white')
                 self.ax.set_facecolor('white')
         
@@ -89,20 +128,95 @@ class InteractiveWeatherChart(ttk.Frame):
         self.ax.set_ylabel('Value', fontsize=12)
         self.ax.set_title('Weather Data Visualization', fontsize=14, fontweight='bold')
 
-    def plot_data(self):
+    def open_archive(self, archive, days=7):
+        """Browse a WeatherArchive, starting on its most recent days.
+        
+        The columns stay memory-mapped; zooming and panning only page in
+        the samples of the visible window.
+        """
+        self.data = archive
+        if len(archive) > 0:
+            end = archive['timestamps'][-1]
+            self.plot_data(xlim=(end - days, end))
+    
+    def append_data(self, new_samples):
+        """Append samples to the loaded data and re-decimate the view.
+        
+        With an archive open the samples are written to it. The lines pick
+        up the grown columns without copying them, and only the visible
+        window is decimated again.
+        """
+        self.data.append(new_samples)
+        if not self.plotted_series:
+            self.plot_data()
+            return
+        
+        timestamps = np.asarray(self.data['timestamps'], dtype=float)
+        self.plotted_series = [(line, field, timestamps, np.asarray(self.data[field], dtype=float))
+                               for line, field, x, y in self.plotted_series]
+        
+        if self.ax.get_autoscalex_on():
+            # Not zoomed: grow the view to the new data; the xlim_changed
+            # callback then decimates the new window
+            for line, field, x, y in self.plotted_series:
+                line.set_data(*self._decimate(x, y))
+            self.ax.relim()
+            self.ax.autoscale_view()
+        else:
+            self._redecimate()
+        self.canvas.draw_idle()
+    
+    def mark_anomalies(self, detector):
+        """Scan the loaded data with an AnomalyDetector and mark its finds.
+        
+        Call again after loading new data; pass None to clear the markers.
+        Returns the detector.scan() results.
+        """
+        found = {}
+        times = []
+        values = []
+        if detector is not None and len(self.data) > 0:
+            timestamps = np.asarray(self.data['timestamps'], dtype=float)
+            columns = {field: np.asarray(self.data[field], dtype=float)
+                       for field in detector.fields if field in self.data}
+            found = detector.scan(timestamps, columns)
+            for field, (indices, flags) in found.items():
+                if len(indices):
+                    times.append(timestamps[indices])
+                    values.append(columns[field][indices])
+        
+        if times or self.anomaly_overlay is not None:
+            if self.anomaly_overlay is None:
+                self.anomaly_overlay = WeatherOverlay(self.ax)
+            self.anomaly_overlay.set_anomaly_markers(np.concatenate(times) if times else [],
+                                                     np.concatenate(values) if values else [])
+            self.canvas.draw_idle()
+        return found
+    
+    def plot_data(self, xlim=None):
         self.ax.clear()
+        self.plotted_series = []
+        # ax.clear() removed the markers too
+        self.anomaly_overlay = None
         timestamps = self.data.get('timestamps', [])
         temperature = self.data.get('temperature', [])
         humidity = self.data.get('humidity', [])
         pressure = self.data.get('pressure', [])
 
         if len(timestamps) > 0:
-            self.ax.plot(timestamps, temperature, color='red', label='Temperature')
-            self.ax.plot(timestamps, humidity, color='blue', label='Humidity')
-            self.ax.plot(timestamps, pressure, color='green', label='Pressure')
+            # Start on a window instead of decimating the whole history
+            if xlim is not None:
+                self.ax.set_xlim(xlim)
+
+            self._plot_series('temperature', timestamps, temperature, color='red', label='Temperature')
+            self._plot_series('humidity', timestamps, humidity, color='blue', label='Humidity')
+            self._plot_series('pressure', timestamps, pressure, color='green', label='Pressure')
 
             self.ax.legend(loc='upper right')
             self.ax.grid(True, alpha=0.3)
             self.ax.set_title("Weather Data Visualization")
 
+            # ax.clear() dropped the axes callbacks, so hook zooming up again
+            self.ax.callbacks.connect('xlim_changed', self._on_xlim_changed)
+
             self.canvas.draw_idle()
@@ -1,15 +1,22 @@
+import functools
 import tkinter as tk
-from tkinter import ttk
+from tkinter import messagebox, ttk
 import matplotlib
 matplotlib.use('TkAgg')  # Ensure we're using the Tkinter backend
+import matplotlib.collections
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
 from matplotlib.figure import Figure
-import matplotlib.pyplot as plt
 import numpy as np
-from datetime import datetime, timedelta
-import json
-from hovertooltip import HoverTooltip
+from hovertooltip import HoverTooltip, DataCursor
+from datelabels import DateLabelFormatter
 from interactiveoverlays import WeatherOverlay
+from blitmanager import BlitManager
+from downsampling import MinMaxPyramid
+from precipitationbars import PrecipitationBars
+from axissync import AxisSyncScheduler
+from weatheringest import ChunkedLoader
+from perfmonitor import PerfMonitor, PerfHUD
+from rendercache import RenderCache
 
 class SynchronizedWeatherDashboard(ttk.Frame):
     def __init__(self, parent, preference_manager=None):
@@ -17,6 +24,34 @@ class SynchronizedWeatherDashboard(ttk.Frame):
         self.pref_manager = preference_manager
         self.charts = []
         self.shared_x_axis = None
+        self.crosshair_lines = []
+        
+        # Tooltips show every series at the hovered time, from the raw samples
+        self.data_cursor = DataCursor()
+        
+        # Last dataset shown, and its WeatherDataStore version
+        self.weather_data = None
+        self.data_version = None
+        
+        # WeatherArchive being browsed, and the time range loaded from it
+        self.archive = None
+        self.archive_window = None
+        
+        # ChunkedLoader streaming a file in, if any
+        self.loader = None
+        
+        # SharedRingReader polled for live samples, if any
+        self.shared_reader = None
+        
+        # Opt-in latency instrumentation, see enable_instrumentation
+        self.perf_monitor = None
+        self.perf_huds = []
+        
+        # Rendered chart backgrounds, reused when a view comes back. The
+        # version counts dataset changes that aren't an archive growing.
+        cache_mb = self.pref_manager.get('display', 'render_cache_mb', 64) if self.pref_manager else 64
+        self.render_cache = RenderCache(max_bytes=cache_mb * 2**20)
+        self.render_version = 0
         
         # Create the dashboard layout
         self._create_layout()
@@ -81,8 +116,9 @@ class SynchronizedWeatherDashboard(ttk.Frame):
             'canvas': canvas,
             'toolbar': toolbar,
             'data_lines': [],
+            'lod_series': {},  # field -> (artist, MinMaxPyramid)
             'overlays': WeatherOverlay(ax),
-            'tooltip': HoverTooltip(ax, canvas)
+            'tooltip': HoverTooltip(ax, canvas, use_blitting=True)
         })
         
         return ax
@@ -109,8 +145,9 @@ class SynchronizedWeatherDashboard(ttk.Frame):
             'canvas': canvas,
             'toolbar': toolbar,
             'data_lines': [],
+            'lod_series': {},  # field -> (artist, MinMaxPyramid)
             'overlays': WeatherOverlay(ax),
-            'tooltip': HoverTooltip(ax, canvas)
+            'tooltip': HoverTooltip(ax, canvas, use_blitting=True)
         })
         
         return ax
@@ -141,8 +178,9 @@ class SynchronizedWeatherDashboard(ttk.Frame):
             'canvas': canvas,
             'toolbar': toolbar,
             'data_lines': [],
+            'lod_series': {},  # field -> (artist, MinMaxPyramid)
             'overlays': WeatherOverlay(ax),
-            'tooltip': HoverTooltip(ax, canvas)
+            'tooltip': HoverTooltip(ax, canvas, use_blitting=True)
         })
         
         return ax
@@ -169,118 +207,466 @@ class SynchronizedWeatherDashboard(ttk.Frame):
             'canvas': canvas,
             'toolbar': toolbar,
             'data_lines': [],
+            'lod_series': {},  # field -> (artist, MinMaxPyramid)
             'overlays': WeatherOverlay(ax),
-            'tooltip': HoverTooltip(ax, canvas)
+            'tooltip': HoverTooltip(ax, canvas, use_blitting=True)
         })
         
         return ax
     
     def _setup_synchronization(self):
         """Setup synchronized zooming and panning."""
+        # One scheduler batches limit changes and redraws per Tk idle cycle
+        self.sync_scheduler = AxisSyncScheduler(schedule=self.after_idle)
+        
         # Connect zoom/pan events
         for chart in self.charts:
-            chart['canvas'].mpl_connect('motion_notify_event', 
-                                      lambda event, c=chart: self._on_motion(event, c))
+            # A partial rather than a lambda, so timings name the handler
+            chart['canvas'].mpl_connect('motion_notify_event',
+                                        functools.partial(self._on_motion, chart=chart))
             
-            # Synchronize zoom events
-            chart['ax'].callbacks.connect('xlim_changed', self._on_xlim_changed)
+            # Synchronize zoom events; each redraw pulls the matching level of detail
+            self.sync_scheduler.add(chart['ax'], chart['canvas'],
+                                    on_sync=lambda c=chart: self._on_sync(c))
+            
+            chart['tooltip'].set_data_cursor(self.data_cursor)
+            
+            # Views seen before are blitted from the render cache
+            self.render_cache.attach(chart['canvas'], lambda c=chart: self._render_key(c))
     
-    def _on_xlim_changed(self, ax):
-        """Handle x-axis limit changes for synchronization."""
-        # Update all other charts to match
-        xlim = ax.get_xlim()
-        for chart in self.charts:
-            if chart['ax'] != ax and chart['ax'].get_xlim() != xlim:
-                chart['ax'].set_xlim(xlim)
-                chart['canvas'].draw_idle()
+    def _render_key(self, chart):
+        """Everything besides size and DPI that a chart's rendering depends on."""
+        if self.archive is not None:
+            # Windows of one archive show the same data wherever they overlap
+            data = ('archive', id(self.archive), len(self.archive))
+        else:
+            data = self.render_version
+        limits = tuple((ax.get_xlim(), ax.get_ylim()) for ax in self._chart_axes(chart))
+        overlays = tuple(id(artist) for artist in chart['overlays'].overlays)
+        theme = self.pref_manager.get('display', 'theme', 'light') if self.pref_manager else None
+        return data, limits, overlays, theme
+    
+    def enable_instrumentation(self, hud=True):
+        """Record per-chart latency histograms, optionally with an on-canvas HUD.
+        
+        Timings are available from self.perf_monitor.stats(). The HUD shows
+        fps, the last draw time and the number of charts and file chunks
+        waiting to be processed.
+        """
+        if self.perf_monitor is None:
+            self.perf_monitor = PerfMonitor()
+            for chart in self.charts:
+                self.perf_monitor.add_chart(chart['name'], chart['canvas'], self._chart_axes(chart))
+                # Hover cost split into the tooltip and its data search
+                self.perf_monitor.time_method(chart['tooltip'], 'update', chart['name'], 'tooltip_update')
+            self.perf_monitor.time_method(self.data_cursor, 'lookup', 'dashboard', 'cursor_lookup')
+            self.perf_monitor.time_method(self.sync_scheduler, 'flush', 'dashboard', 'sync_flush')
+            # Per-chart level-of-detail refreshes run inside the flush
+            self.perf_monitor.time_method(self, '_on_sync', 'dashboard', 'sync_chart')
+        self.perf_monitor.enable()
+        
+        if hud and not self.perf_huds:
+            for chart in self.charts:
+                self.perf_huds.append(PerfHUD(self.perf_monitor, chart['name'], chart['ax'],
+                                              chart['canvas'], queue_depth=self._queue_depth))
+    
+    def disable_instrumentation(self):
+        """Stop timing and remove the HUD; recorded timings are kept."""
+        for hud in self.perf_huds:
+            hud.remove()
+        self.perf_huds = []
+        if self.perf_monitor is not None:
+            self.perf_monitor.disable()
+    
+    def _queue_depth(self):
+        """Charts waiting for a sync flush plus parsed chunks waiting to be drawn."""
+        depth = self.sync_scheduler.pending
+        if self.loader is not None and not self.loader.finished:
+            depth += self.loader.chunks.qsize()
+        return depth
+    
+    def _on_sync(self, chart):
+        """Bring a chart up to date with the synchronized x-range."""
+        self._ensure_archive_window()
+        self._refresh_level_of_detail(chart)
+    
+    def _set_line(self, chart, field, x, y, *args, **kwargs):
+        """Point a chart line at new data, creating the line on first use.
+        
+        The line is drawn from a min/max pyramid so redraws stay O(pixel width).
+        """
+        if field in chart['lod_series']:
+            line = chart['lod_series'][field][0]
+        else:
+            line = chart['ax'].plot([], [], *args, **kwargs)[0]
+            chart['data_lines'].append(line)
+            chart['tooltip'].add_line(line, kwargs['label'])
+            chart['legend_stale'] = True
+        
+        chart['lod_series'][field] = (line, MinMaxPyramid(x, y))
+        return line
+    
+    def _set_scatter(self, chart, ax, field, x, y, **kwargs):
+        """Point a chart scatter at new data, creating it on first use."""
+        if field in chart['lod_series']:
+            scatter = chart['lod_series'][field][0]
+        else:
+            scatter = ax.scatter([], [], **kwargs)
+        
+        chart['lod_series'][field] = (scatter, MinMaxPyramid(x, y))
+        return scatter
+    
+    def _chart_width(self, chart):
+        """Width of a chart's plotting area in pixels."""
+        return chart['ax'].get_window_extent().width
+    
+    def _chart_axes(self, chart):
+        """All axes of a chart, including a secondary y-axis."""
+        return [chart['ax'], chart['ax2']] if 'ax2' in chart else [chart['ax']]
+    
+    def _refresh_level_of_detail(self, chart, full_range=False):
+        """Swap in the pyramid level matching the chart's current x-range."""
+        xlim = None if full_range else chart['ax'].get_xlim()
+        width = self._chart_width(chart)
+        for artist, pyramid in chart['lod_series'].values():
+            if isinstance(artist, PrecipitationBars):
+                # The wettest sample per bucket, in bars at least a pixel wide
+                x, y = pyramid.peaks(xlim, width)
+                if xlim is not None:
+                    span = xlim[1] - xlim[0]
+                else:
+                    span = pyramid.x[-1] - pyramid.x[0] if len(pyramid) else 0.0
+                artist.width = max(0.02, span / max(width, 1))
+                artist.set_data(x, y)
+                continue
+            
+            x, y = pyramid.view(xlim, width)
+            if isinstance(artist, matplotlib.collections.PathCollection):
+                artist.set_offsets(np.column_stack([x, y]))
+            else:
+                artist.set_data(x, y)
     
     def _on_motion(self, event, chart):
         """Handle mouse motion for synchronized crosshair."""
         if event.inaxes:
-            # Update tooltips
-            chart['tooltip'].update(event)
-            
             # Update crosshair on all charts
-            if hasattr(self, 'crosshair_lines'):
+            if self.crosshair_lines:
                 for line in self.crosshair_lines:
                     line.set_xdata([event.xdata, event.xdata])
             else:
-                self.crosshair_lines = []
                 for c in self.charts:
                     line = c['ax'].axvline(x=event.xdata, color='gray', 
                                          linestyle='--', alpha=0.5, linewidth=1)
+                    BlitManager.for_canvas(c['canvas']).add_artist(line)
                     self.crosshair_lines.append(line)
             
-            # Redraw all charts
+            # Update tooltips; the blit below repaints them with the crosshair
+            chart['tooltip'].update(event, redraw=False)
+            
+            # Blit the crosshair and tooltip over each chart's cached background
             for c in self.charts:
-                c['canvas'].draw_idle()
+                BlitManager.for_canvas(c['canvas']).update()
     
     def update_data(self, weather_data):
-        """Update all charts with new weather data."""
-        # Clear existing data
-        for chart in self.charts:
-            chart['ax'].clear()
-            chart['data_lines'] = []
+        """Update all charts with new weather data.
+        
+        Artists are created on the first call and reused afterwards, so a
+        refresh costs a data copy plus one redraw per chart. weather_data is
+        a WeatherDataStore or a dict of sequences with the same fields.
+        """
+        # A store that hasn't changed since the last update needs no rebuild
+        version = getattr(weather_data, 'version', None)
+        if weather_data is self.weather_data and version is not None and version == self.data_version:
+            for chart in self.charts:
+                self._apply_chart_theme(chart)
+                self.sync_scheduler.request_redraw(chart['ax'])
+            return
+        
+        self.archive = None
+        self._set_dataset(weather_data, reset_view=True)
+    
+    def open_archive(self, archive, days=7):
+        """Browse a WeatherArchive, starting on its most recent days.
+        
+        Only a window around the visible range is read from disk. Panning
+        or zooming outside it loads the window around the new view.
+        """
+        self.archive = archive
+        self.archive_window = None
+        if len(archive) == 0:
+            return
+        
+        end = archive['timestamps'][-1]
+        self.shared_x_axis.set_xlim(end - days, end)
+        self._ensure_archive_window()
+    
+    def load_file(self, path, chunk_rows=100000, on_done=None, on_error=None):
+        """Stream a CSV or Parquet export into the charts as it is parsed.
+        
+        A small first chunk is drawn as soon as it is parsed, and the rest
+        of the file is appended chunk by chunk while it loads in the
+        background. If the file can't be read, the charts go back to the
+        data shown before and on_error(exception) is called; by default
+        the error is shown in a message box.
+        """
+        if self.loader is not None:
+            self.loader.cancel()
+        previous_archive = self.archive
+        previous_data = self.weather_data
+        self.archive = None
+        
+        first = True
+        
+        def on_chunk(chunk):
+            nonlocal first
+            if first:
+                first = False
+                self.update_data(chunk)
+            else:
+                self.append_data(chunk)
+        
+        def on_load_error(error):
+            # Drop the half-loaded file in favour of what was shown before
+            if previous_archive is not None:
+                self.archive = previous_archive
+                self.archive_window = None
+                self._ensure_archive_window()
+            elif previous_data is not None:
+                self.update_data(previous_data)
+            
+            if on_error is not None:
+                on_error(error)
+            else:
+                messagebox.showerror("Load failed", f"Could not load {path}:\n{error}", parent=self)
+        
+        self.loader = ChunkedLoader(path, on_chunk, self.after, chunk_rows=chunk_rows,
+                                    on_done=on_done, on_error=on_load_error)
+        self.loader.start()
+    
+    def attach_shared_ring(self, reader, interval_ms=250):
+        """Append samples from a SharedRingReader every interval_ms.
+        
+        The ring is written by an ingestion process; each poll appends the
+        new region straight from shared memory. Pass None to stop.
+        """
+        self.shared_reader = reader
+        if reader is not None:
+            self.after(interval_ms, lambda: self._poll_shared_ring(reader, interval_ms))
+    
+    def _poll_shared_ring(self, reader, interval_ms):
+        """Append what the ingestion process wrote since the last poll."""
+        if reader is not self.shared_reader:
+            return
+        
+        columns = reader.read_new()
+        if columns is not None:
+            self.append_data(columns)
+        self.after(interval_ms, lambda: self._poll_shared_ring(reader, interval_ms))
+    
+    def _ensure_archive_window(self):
+        """Load the archive samples around the view if it left the loaded window."""
+        if self.archive is None:
+            return
+        
+        start, end = self.shared_x_axis.get_xlim()
+        if self.archive_window is not None and self.archive_window[0] <= start and end <= self.archive_window[1]:
+            return
+        
+        # A view-width of margin either side keeps short pans in memory
+        span = end - start
+        self.archive_window = (start - span, end + span)
+        self._set_dataset(self.archive.time_slice(*self.archive_window), reset_view=False)
+    
+    def _set_dataset(self, weather_data, reset_view):
+        """Point every chart at a dataset, optionally resetting the zoom."""
+        self.weather_data = weather_data
+        self.data_version = getattr(weather_data, 'version', None)
+        self.render_version += 1
         
         # Extract data
         timestamps = weather_data['timestamps']
         
         # Update temperature chart
-        temp_chart = next(c for c in self.charts if c['name'] == 'temperature')
-        temp_line = temp_chart['ax'].plot(timestamps, weather_data['temperature'], 
-                                        'r-', label='Temperature')[0]
-        temp_chart['data_lines'].append(temp_line)
-        temp_chart['tooltip'].add_line(temp_line, 'Temperature')
+        temp_chart = self._get_chart('temperature')
+        self._set_line(temp_chart, 'temperature', timestamps, weather_data['temperature'],
+                       'r-', label='Temperature')
         
         # Add feels-like temperature if available
         if 'feels_like' in weather_data:
-            feels_line = temp_chart['ax'].plot(timestamps, weather_data['feels_like'], 
-                                             'r--', alpha=0.7, label='Feels Like')[0]
-            temp_chart['data_lines'].append(feels_line)
-            temp_chart['tooltip'].add_line(feels_line, 'Feels Like')
+            self._set_line(temp_chart, 'feels_like', timestamps, weather_data['feels_like'],
+                           'r--', alpha=0.7, label='Feels Like')
         
         # Update precipitation chart
-        precip_chart = next(c for c in self.charts if c['name'] == 'precipitation')
-        precip_bars = precip_chart['ax'].bar(timestamps, weather_data['precipitation'], 
-                                           width=0.02, alpha=0.7, label='Precipitation')
+        precip_chart = self._get_chart('precipitation')
+        self._set_precipitation(precip_chart, timestamps, weather_data['precipitation'])
         
         # Update wind chart
-        wind_chart = next(c for c in self.charts if c['name'] == 'wind')
-        wind_speed_line = wind_chart['ax'].plot(timestamps, weather_data['wind_speed'], 
-                                              'g-', label='Wind Speed')[0]
-        wind_chart['data_lines'].append(wind_speed_line)
-        wind_chart['tooltip'].add_line(wind_speed_line, 'Wind Speed')
+        wind_chart = self._get_chart('wind')
+        self._set_line(wind_chart, 'wind_speed', timestamps, weather_data['wind_speed'],
+                       'g-', label='Wind Speed')
         
         # Add wind direction on secondary axis
         if 'wind_direction' in weather_data:
-            wind_dir_scatter = wind_chart['ax2'].scatter(timestamps, weather_data['wind_direction'], 
-                                                       c='blue', s=20, alpha=0.6, label='Direction')
+            self._set_scatter(wind_chart, wind_chart['ax2'], 'wind_direction', timestamps,
+                              weather_data['wind_direction'],
+                              c='blue', s=20, alpha=0.6, label='Direction')
             wind_chart['ax2'].set_ylabel('Wind Direction (°)', color='blue')
             wind_chart['ax2'].tick_params(axis='y', labelcolor='blue')
         
         # Update pressure chart
-        pressure_chart = next(c for c in self.charts if c['name'] == 'pressure')
-        pressure_line = pressure_chart['ax'].plot(timestamps, weather_data['pressure'], 
-                                                'b-', label='Pressure')[0]
-        pressure_chart['data_lines'].append(pressure_line)
-        pressure_chart['tooltip'].add_line(pressure_line, 'Pressure')
+        pressure_chart = self._get_chart('pressure')
+        self._set_line(pressure_chart, 'pressure', timestamps, weather_data['pressure'],
+                       'b-', label='Pressure')
         
-        # Format all charts
+        # A new dataset resets any zoom, as a fresh plot would
         for chart in self.charts:
-            chart['ax'].legend(loc='upper right')
-            chart['ax'].grid(True, alpha=0.3)
-            chart['ax'].margins(x=0.01)
+            self._drop_missing_series(chart, weather_data)
             
-            # Format x-axis
-            chart['ax'].xaxis.set_major_formatter(
-                matplotlib.dates.DateFormatter('%m/%d %H:%M')
-            )
-            chart['figure'].autofmt_xdate()
+            if reset_view:
+                for ax in self._chart_axes(chart):
+                    ax.autoscale(True)
             
             # Apply theme
             self._apply_chart_theme(chart)
+        
+        self._finish_update()
+    
+    def append_data(self, new_samples):
+        """Append new samples (same keys as update_data) to the charts.
+        
+        Only the pyramid buckets the new samples fall in are recomputed.
+        Charts the user has zoomed or panned keep their view. When browsing
+        an archive, the samples are also written to it.
+        """
+        if self.archive is not None:
+            self.archive.append(new_samples)
+        
+        if not any(chart['lod_series'] for chart in self.charts):
+            self.update_data(new_samples)
+            return
+        
+        timestamps = np.asarray(new_samples['timestamps'], dtype=float)
+        gap = np.full(len(timestamps), np.nan)
+        self.render_version += 1
+        
+        for chart in self.charts:
+            for field, (artist, pyramid) in chart['lod_series'].items():
+                pyramid.extend(timestamps, new_samples.get(field, gap))
+        
+        self._finish_update()
+    
+    def mark_anomalies(self, detector):
+        """Scan the loaded samples with an AnomalyDetector and mark its finds.
+        
+        Each chart marks the anomalies of the fields it plots on its main
+        axes. Call again after loading new data; pass None to clear the
+        markers. Returns detector.scan() results merged over the charts.
+        """
+        found = {}
+        for chart in self.charts:
+            times = []
+            values = []
+            for field, (artist, pyramid) in chart['lod_series'].items():
+                # Skip series on a secondary y-axis such as wind direction;
+                # the bars have no axes attribute and are on the main axes
+                if detector is None or getattr(artist, 'axes', chart['ax']) is not chart['ax']:
+                    continue
+                found.update(detector.scan(pyramid.x, {field: pyramid.y}))
+                if field in found and len(found[field][0]):
+                    indices = found[field][0]
+                    times.append(pyramid.x[indices])
+                    values.append(pyramid.y[indices])
+            
+            overlay = chart['overlays']
+            if times or overlay.anomaly_markers is not None:
+                created = overlay.anomaly_markers is None
+                overlay.set_anomaly_markers(np.concatenate(times) if times else [],
+                                            np.concatenate(values) if values else [])
+                if created:
+                    chart['ax'].legend(loc='upper right')
+            self.sync_scheduler.request_redraw(chart['ax'])
+        
+        # The markers are not part of the render key
+        self.render_cache.clear()
+        return found
+    
+    def _drop_missing_series(self, chart, weather_data):
+        """Remove optional series that the new dataset doesn't have."""
+        for field in [f for f in chart['lod_series'] if f not in weather_data]:
+            artist = chart['lod_series'].pop(field)[0]
+            artist.remove()
+            if artist in chart['data_lines']:
+                chart['data_lines'].remove(artist)
+                chart['tooltip'].remove_line(artist)
+            chart['legend_stale'] = True
+    
+    def _get_chart(self, name):
+        """Look up a chart by name."""
+        return next(c for c in self.charts if c['name'] == name)
+    
+    def _set_precipitation(self, chart, timestamps, precipitation):
+        """Show precipitation as one bar collection, created on first use.
+        
+        Like the lines, the bars are drawn from a min/max pyramid, so each
+        view only holds a bar for the wettest sample per bucket.
+        """
+        if 'precipitation' in chart['lod_series']:
+            bars = chart['lod_series']['precipitation'][0]
+        else:
+            bars = PrecipitationBars(chart['ax'], width=0.02, alpha=0.7, label='Precipitation')
+            chart['legend_stale'] = True
+        
+        chart['lod_series']['precipitation'] = (bars, MinMaxPyramid(timestamps, precipitation))
+    
+    def _update_data_cursor(self):
+        """Point the data cursor at the full-resolution samples of every chart.
+        
+        All pyramids hold the same timestamps, so one of them serves as the
+        shared index.
+        """
+        timestamps = np.empty(0)
+        series = []
+        for chart in self.charts:
+            for artist, pyramid in chart['lod_series'].values():
+                timestamps = pyramid.x
+                series.append((artist.get_label(), pyramid.y))
+        self.data_cursor.set_data(timestamps, series)
+    
+    def _finish_update(self):
+        """Format new charts, rescale to the data and request one redraw each."""
+        self._update_data_cursor()
+        
+        for chart in self.charts:
+            if not chart.get('formatted'):
+                chart['ax'].grid(True, alpha=0.3)
+                chart['ax'].margins(x=0.01)
+                
+                # Format x-axis
+                chart['ax'].xaxis.set_major_formatter(
+                    DateLabelFormatter('%m/%d %H:%M')
+                )
+                chart['figure'].autofmt_xdate()
+                chart['formatted'] = True
             
-            chart['canvas'].draw()
+            if chart.pop('legend_stale', False):
+                chart['ax'].legend(loc='upper right')
+        
+        # Fit charts that aren't zoomed to the data: to the full dataset along
+        # x, and to what is visible along y. Check and relim them all before
+        # autoscaling, since the limits are shared.
+        autoscaled = [chart for chart in self.charts
+                      if chart['ax'].get_autoscalex_on() or chart['ax'].get_autoscaley_on()]
+        for chart in autoscaled:
+            self._refresh_level_of_detail(chart, full_range=chart['ax'].get_autoscalex_on())
+            for ax in self._chart_axes(chart):
+                ax.relim()
+        for chart in autoscaled:
+            for ax in self._chart_axes(chart):
+                ax.autoscale_view()
+        
+        # Each chart pulls its level of detail and redraws once, batched
+        for chart in self.charts:
+            self.sync_scheduler.request_redraw(chart['ax'])
     
     def _apply_chart_theme(self, chart):
         """Apply theme to individual chart."""
@@ -0,0 +1,265 @@
+import functools
+import time
+from bisect import bisect_left
+from collections import deque
+
+from blitmanager import BlitManager
+
+
+class LatencyHistogram:
+    """Latency counts in log-spaced bins from 1 µs to 10 s, 8 bins per decade."""
+
+    EDGES_MS = [10 ** (k / 8) for k in range(-24, 33)]
+
+    def __init__(self):
+        self.bins = [0] * (len(self.EDGES_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.last_ms = 0.0
+
+    def add(self, ms):
+        self.bins[bisect_left(self.EDGES_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        self.last_ms = ms
+
+    def percentile(self, q):
+        """Upper edge of the bin holding the q-th percentile (an upper bound)."""
+        if self.count == 0:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for i, count in enumerate(self.bins):
+            seen += count
+            if count and seen >= rank:
+                break
+        if i == len(self.EDGES_MS):
+            return self.max_ms
+        return min(self.EDGES_MS[i], self.max_ms)
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'mean_ms': self.total_ms / self.count if self.count else 0.0,
+            'p50_ms': self.percentile(50),
+            'p95_ms': self.percentile(95),
+            'p99_ms': self.percentile(99),
+            'max_ms': self.max_ms,
+            'last_ms': self.last_ms
+        }
+
+
+def _handler_name(func):
+    """Qualified name of a callback, looking through functools.partial."""
+    while isinstance(func, functools.partial):
+        func = func.func
+    return getattr(func, '__qualname__', None) or type(func).__qualname__
+
+
+class PerfMonitor:
+    """Opt-in latency instrumentation for chart canvases.
+
+    While enabled, the monitor times each event handler of the added
+    canvases and their axes (such as xlim_changed) on its own, recorded
+    as 'event_name: Handler.qualname' so the dashboard's hover handler and
+    the toolbar's are told apart. It also times full draws, Agg rendering
+    and blits, and records everything in per-chart histograms. The
+    timing wrappers are instance attributes installed by enable() and
+    removed by disable(), so a disabled monitor costs nothing.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.charts = []  # (chart name, canvas, axes)
+        self.histograms = {}  # chart name -> {timed name -> LatencyHistogram}
+        self.frame_times = {}  # chart name -> recent screen update times
+        self._methods = []  # (obj, attr, chart name, timed name) to wrap
+        self._wrapped = []  # (obj, attr, instance attribute it shadowed) currently wrapped
+        self._drawing = set()  # canvases inside a full draw
+        self._suspended = 0
+
+    def add_chart(self, name, canvas, axes=()):
+        """Time the events, draws and blits of a chart's canvas."""
+        self.charts.append((name, canvas, list(axes)))
+        self.histograms.setdefault(name, {})
+        self.frame_times.setdefault(name, deque(maxlen=240))
+
+        methods = [(canvas.callbacks, 'process', name, 'event')]
+        methods += [(ax.callbacks, 'process', name, 'event') for ax in axes]
+        methods += [
+            (canvas, 'draw', name, 'draw'),
+            (canvas.figure, 'draw', name, 'render'),
+            (canvas, 'blit', name, 'blit')
+        ]
+        self._methods.extend(methods)
+        if self.enabled:
+            for method in methods:
+                self._wrap(*method)
+
+    def time_method(self, obj, attr, chart, name):
+        """Also time obj.attr() calls under the given chart and name."""
+        self._methods.append((obj, attr, chart, name))
+        self.histograms.setdefault(chart, {})
+        if self.enabled:
+            self._wrap(obj, attr, chart, name)
+
+    def enable(self):
+        """Install the timing wrappers."""
+        if not self.enabled:
+            self.enabled = True
+            for method in self._methods:
+                self._wrap(*method)
+
+    def disable(self):
+        """Remove the timing wrappers, restoring the original methods."""
+        self.enabled = False
+        # The wrappers shadow the methods as instance attributes; put back
+        # any instance attribute they covered, such as a RenderCache hook
+        for obj, attr, shadowed in reversed(self._wrapped):
+            if shadowed is None:
+                vars(obj).pop(attr, None)
+            else:
+                setattr(obj, attr, shadowed)
+        self._wrapped = []
+
+    def reset(self):
+        """Forget all recorded timings."""
+        for name in self.histograms:
+            self.histograms[name] = {}
+        for times in self.frame_times.values():
+            times.clear()
+
+    def _wrap(self, obj, attr, chart, kind):
+        """Shadow obj.attr with a timing wrapper."""
+        original = getattr(obj, attr)
+        clock = time.perf_counter
+
+        if kind == 'event':
+            # CallbackRegistry.process(event_name, ...), dispatching to each
+            # handler itself so that every handler is timed on its own
+            def timed(event_name, *args, **kwargs):
+                if obj._signals is not None and event_name not in obj._signals:
+                    return original(event_name, *args, **kwargs)
+                for ref in list(obj.callbacks.get(event_name, {}).values()):
+                    func = ref()
+                    if func is None:
+                        continue
+                    start = clock()
+                    try:
+                        func(*args, **kwargs)
+                    except Exception as exc:
+                        if obj.exception_handler is None:
+                            raise
+                        obj.exception_handler(exc)
+                    finally:
+                        self.record(chart, f'{event_name}: {_handler_name(func)}', clock() - start)
+        elif kind == 'draw':
+            def timed(*args, **kwargs):
+                self._drawing.add(obj)
+                start = clock()
+                try:
+                    return original(*args, **kwargs)
+                finally:
+                    self._drawing.discard(obj)
+                    self.record(chart, 'draw', clock() - start, frame=True)
+        elif kind == 'blit':
+            def timed(*args, **kwargs):
+                start = clock()
+                try:
+                    return original(*args, **kwargs)
+                finally:
+                    # A blit ending a full draw isn't a frame of its own
+                    self.record(chart, 'blit', clock() - start, frame=obj not in self._drawing)
+        else:
+            def timed(*args, **kwargs):
+                start = clock()
+                try:
+                    return original(*args, **kwargs)
+                finally:
+                    self.record(chart, kind, clock() - start)
+
+        self._wrapped.append((obj, attr, vars(obj).get(attr)))
+        setattr(obj, attr, timed)
+
+    def record(self, chart, name, seconds, frame=False):
+        """Add one timing, in seconds, to a chart's histogram for name."""
+        if self._suspended:
+            return
+        histograms = self.histograms.setdefault(chart, {})
+        histogram = histograms.get(name)
+        if histogram is None:
+            histogram = histograms[name] = LatencyHistogram()
+        histogram.add(seconds * 1000)
+        if frame:
+            self.frame_times.setdefault(chart, deque(maxlen=240)).append(time.perf_counter())
+
+    def suspend(self):
+        """Stop recording until resume(), e.g. while the HUD repaints itself."""
+        self._suspended += 1
+
+    def resume(self):
+        self._suspended -= 1
+
+    def fps(self, chart, window=1.0):
+        """Screen updates per second of a chart over the last window seconds."""
+        times = self.frame_times.get(chart, ())
+        now = time.perf_counter()
+        return sum(1 for t in times if now - t <= window) / window
+
+    def stats(self, chart=None):
+        """Summaries per chart and timed name, or for one chart."""
+        if chart is not None:
+            return {name: h.summary() for name, h in self.histograms.get(chart, {}).items()}
+        return {name: self.stats(name) for name in self.histograms}
+
+
+class PerfHUD:
+    """Overlay with fps, last draw time and queue depth, refreshed by blitting."""
+
+    def __init__(self, monitor, chart, ax, canvas, queue_depth=None, interval=500):
+        self.monitor = monitor
+        self.chart = chart
+        self.canvas = canvas
+        self.queue_depth = queue_depth  # callable returning pending work, or None
+
+        self.text = ax.text(
+            0.99, 0.97, '',
+            transform=ax.transAxes,
+            ha='right', va='top',
+            family='monospace', fontsize=8,
+            bbox=dict(boxstyle='round,pad=0.3', fc='black', alpha=0.6),
+            color='white',
+            zorder=1001
+        )
+        self.blit_manager = BlitManager.for_canvas(canvas)
+        self.blit_manager.add_artist(self.text)
+
+        self.timer = canvas.new_timer(interval=interval)
+        self.timer.add_callback(self.refresh)
+        self.timer.start()
+
+    def refresh(self):
+        """Update the numbers and blit them."""
+        draw = self.monitor.histograms.get(self.chart, {}).get('draw')
+        lines = [
+            f"{self.monitor.fps(self.chart):5.1f} fps",
+            f"draw {draw.last_ms:7.1f} ms" if draw else "draw       - ms"
+        ]
+        if self.queue_depth is not None:
+            lines.append(f"queue {self.queue_depth():5d}")
+        self.text.set_text('\n'.join(lines))
+
+        # Repainting the HUD shouldn't show up in its own numbers
+        self.monitor.suspend()
+        try:
+            self.blit_manager.update()
+        finally:
+            self.monitor.resume()
+
+    def remove(self):
+        """Stop refreshing and remove the overlay."""
+        self.timer.stop()
+        self.blit_manager.remove_artist(self.text)
+        self.text.remove()
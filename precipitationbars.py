@@ -0,0 +1,55 @@
+import numpy as np
+from matplotlib.collections import PolyCollection
+
+
+class PrecipitationBars:
+    """Precipitation bars drawn as a single PolyCollection.
+
+    ax.bar() creates one Rectangle patch per sample, dry hours included, so
+    drawing and hit-testing scale with the sample count. Here only wet
+    samples get a rectangle and they all live in one artist whose vertices
+    are rebuilt in a single vectorized step. Callers with long series pass
+    a decimated view, such as the wettest sample per pixel, to set_data().
+    """
+
+    def __init__(self, ax, width=0.02, color='C0', **kwargs):
+        self.ax = ax
+        self.width = width
+        self.timestamps = np.empty(0)
+        self.heights = np.empty(0)
+
+        self.collection = PolyCollection([], facecolors=color, edgecolors='none', **kwargs)
+        # Keep autoscaling flush with the baseline, like ax.bar()
+        self.collection.sticky_edges.y.append(0)
+        ax.add_collection(self.collection)
+
+    def set_data(self, timestamps, heights):
+        """Replace the bars with new samples."""
+        self.timestamps = np.asarray(timestamps, dtype=float)
+        self.heights = np.asarray(heights, dtype=float)
+        self._update_verts()
+
+    def get_label(self):
+        """Label of the bars, as shown in legends and the data cursor."""
+        return self.collection.get_label()
+
+    def _update_verts(self):
+        """Rebuild the rectangles of all wet samples."""
+        wet = np.nonzero(np.nan_to_num(self.heights) != 0)[0]
+        x = self.timestamps[wet]
+        top = self.heights[wet]
+        left = x - self.width / 2
+        right = x + self.width / 2
+
+        verts = np.zeros((len(wet), 4, 2))
+        verts[:, 0, 0] = left
+        verts[:, 1, 0] = left
+        verts[:, 1, 1] = top
+        verts[:, 2, 0] = right
+        verts[:, 2, 1] = top
+        verts[:, 3, 0] = right
+        self.collection.set_verts(verts)
+
+    def remove(self):
+        """Remove the bars from the axes."""
+        self.collection.remove()
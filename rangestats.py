@@ -0,0 +1,93 @@
+import numpy as np
+
+
+def _pair_levels(values, combine):
+    """Levels of a bottom-up segment tree: level k combines 2**k values.
+
+    An odd value out at the end of a level is carried up on its own.
+    """
+    levels = [values]
+    while len(levels[-1]) > 1:
+        below = levels[-1]
+        paired = len(below) // 2 * 2
+        levels.append(np.concatenate([combine(below[:paired:2], below[1:paired:2]), below[paired:]]))
+    return levels
+
+
+def _query(levels, lo, hi, combine, empty):
+    """Combine values lo..hi-1 from O(log n) nodes of the levels."""
+    result = empty
+    level = 0
+    while lo < hi:
+        if lo & 1:
+            result = combine(result, levels[level][lo])
+            lo += 1
+        if hi & 1:
+            hi -= 1
+            result = combine(result, levels[level][hi])
+        lo >>= 1
+        hi >>= 1
+        level += 1
+    return result
+
+
+class RangeStats:
+    """Count, sum, mean, std, min and max of any index or time window of a series.
+
+    Built once per dataset in O(n): prefix sums of the values and their
+    squares give count, sum, mean and std of a window by subtraction, and
+    per-level minima and maxima of 2**k buckets give min and max from
+    O(log n) buckets. Windows are found by binary search on the sorted
+    timestamps, so no query rescans the data. NaN gaps are skipped.
+    """
+
+    def __init__(self, x, y):
+        self.x = np.asarray(x, dtype=float)
+        self.y = np.asarray(y, dtype=float)
+
+        valid = ~np.isnan(self.y)
+        # Squares are taken around the mean, which keeps the variance
+        # accurate for values far from zero such as pressures in hPa
+        self.offset = self.y[valid].mean() if valid.any() else 0.0
+        centred = np.where(valid, self.y - self.offset, 0.0)
+
+        self.counts = np.concatenate([[0], np.cumsum(valid)])
+        self.sums = np.concatenate([[0.0], np.cumsum(centred)])
+        self.squares = np.concatenate([[0.0], np.cumsum(centred ** 2)])
+        self.mins = _pair_levels(np.where(valid, self.y, np.inf), np.minimum)
+        self.maxs = _pair_levels(np.where(valid, self.y, -np.inf), np.maximum)
+
+    def __len__(self):
+        return len(self.y)
+
+    def index_range(self, start, end):
+        """Index slice of the samples with start <= x <= end."""
+        return slice(int(np.searchsorted(self.x, start, side='left')),
+                     int(np.searchsorted(self.x, end, side='right')))
+
+    def window(self, start, end):
+        """Aggregates of the samples with start <= x <= end."""
+        window = self.index_range(start, end)
+        return self.aggregate(window.start, window.stop)
+
+    def aggregate(self, lo, hi):
+        """Aggregates of samples lo..hi-1."""
+        hi = max(lo, hi)
+        count = int(self.counts[hi] - self.counts[lo])
+        stats = {'start': lo, 'stop': hi, 'count': count, 'sum': 0.0,
+                 'mean': np.nan, 'std': np.nan, 'min': np.nan, 'max': np.nan}
+        if count == 0:
+            return stats
+
+        centred_sum = self.sums[hi] - self.sums[lo]
+        centred_mean = centred_sum / count
+        variance = (self.squares[hi] - self.squares[lo]) / count - centred_mean ** 2
+
+        stats.update({
+            'sum': float(centred_sum + count * self.offset),
+            'mean': float(centred_mean + self.offset),
+            'std': float(np.sqrt(max(variance, 0.0))),  # Population std
+            'min': float(_query(self.mins, lo, hi, min, np.inf)),
+            'max': float(_query(self.maxs, lo, hi, max, -np.inf))
+        })
+        return stats
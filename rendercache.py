@@ -0,0 +1,111 @@
+from collections import OrderedDict
+
+import numpy as np
+from matplotlib.backend_bases import DrawEvent
+
+from blitmanager import BlitManager
+
+
+class RenderCache:
+    """LRU cache of rendered chart backgrounds, bounded by memory.
+
+    attach() makes a canvas's full draws go through the cache. Each draw
+    asks the chart for a key describing everything that affects the
+    picture (data version, axis limits, theme); the canvas size and DPI
+    are added here. On a hit the stored pixels are restored into the Agg
+    buffer and blitted instead of re-rendering the figure. The stored
+    buffers are the BlitManager backgrounds, so animated artists such as
+    crosshairs and tooltips are never baked in; they are painted on top
+    as after any full draw.
+    """
+
+    def __init__(self, max_bytes=64 * 2**20):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # key -> (buffer region, size in bytes)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        """Return the cached region for key, marking it recently used."""
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, region):
+        """Store a region, evicting the least recently used over max_bytes."""
+        size = np.asarray(region).nbytes
+        if key in self.entries:
+            self.bytes -= self.entries.pop(key)[1]
+        if size > self.max_bytes:
+            return
+        self.entries[key] = (region, size)
+        self.bytes += size
+        self.trim()
+
+    def trim(self):
+        """Evict entries until the cache fits in max_bytes."""
+        while self.bytes > self.max_bytes:
+            self.bytes -= self.entries.popitem(last=False)[1][1]
+            self.evictions += 1
+
+    def clear(self):
+        """Drop every entry, e.g. after changing a chart outside its key."""
+        self.entries.clear()
+        self.bytes = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'entries': len(self.entries),
+            'bytes': self.bytes,
+            'max_bytes': self.max_bytes
+        }
+
+    def attach(self, canvas, key):
+        """Serve canvas.draw() from the cache; key() describes the chart's content.
+
+        key() may return None to bypass the cache for a draw.
+        """
+        manager = BlitManager.for_canvas(canvas)
+        original = canvas.draw
+
+        def draw(*args, **kwargs):
+            view = key()
+            if view is None:
+                return original(*args, **kwargs)
+
+            full_key = (id(canvas), canvas.get_width_height(), canvas.figure.dpi, view)
+            region = self.get(full_key)
+            if region is None:
+                original(*args, **kwargs)
+                # BlitManager copied the buffer before painting animated artists
+                if manager.background is not None:
+                    self.put(full_key, manager.background)
+                return
+
+            renderer = canvas.get_renderer()
+            renderer.restore_region(region)
+            # Listeners see an ordinary full draw; the BlitManager repaints
+            # its artists over the restored pixels
+            canvas.callbacks.process('draw_event', DrawEvent('draw_event', canvas, renderer))
+            canvas.blit()
+
+        # Shadows the class method; detach() removes it
+        canvas.draw = draw
+
+    def detach(self, canvas):
+        """Make a canvas render every draw again."""
+        vars(canvas).pop('draw', None)
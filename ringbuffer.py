@@ -0,0 +1,140 @@
+import math
+from collections import deque
+
+import numpy as np
+
+
+class RingBuffer:
+    """Fixed-capacity circular buffer with O(1) append and zero-copy ordered views.
+
+    Every value is written twice, at ``i`` and ``i + capacity``, so the
+    buffer contents in oldest-to-newest order are always one contiguous
+    slice of the backing array and never need to be unrolled.
+    """
+
+    def __init__(self, capacity, dtype=float, fill_value=np.nan):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+
+        self.capacity = capacity
+        self._data = np.full(2 * capacity, fill_value, dtype=dtype)
+        self._start = 0  # Position of the oldest value
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def is_full(self):
+        return self._size == self.capacity
+
+    def append(self, value):
+        """Append a value, overwriting the oldest one when full."""
+        if self._size < self.capacity:
+            pos = self._start + self._size
+            self._size += 1
+        else:
+            pos = self._start
+            self._start = (self._start + 1) % self.capacity
+
+        self._data[pos] = value
+        self._data[pos + self.capacity] = value
+
+    def extend(self, values):
+        """Append several values at once, as one vectorized write."""
+        # Anything before the last capacity values would be overwritten anyway
+        values = np.asarray(values)[-self.capacity:]
+        count = len(values)
+        if count == 0:
+            return
+
+        positions = (self._start + self._size + np.arange(count)) % self.capacity
+        self._data[positions] = values
+        self._data[positions + self.capacity] = values
+
+        size = self._size + count
+        if size > self.capacity:
+            self._start = (self._start + size - self.capacity) % self.capacity
+            size = self.capacity
+        self._size = size
+
+    def view(self):
+        """Return a read-only view of the contents, oldest first."""
+        view = self._data[self._start:self._start + self._size]
+        view.flags.writeable = False
+        return view
+
+    def first(self):
+        """Return the oldest value."""
+        if self._size == 0:
+            raise IndexError("first() on an empty RingBuffer")
+        return self._data[self._start]
+
+    def last(self):
+        """Return the newest value."""
+        if self._size == 0:
+            raise IndexError("last() on an empty RingBuffer")
+        return self._data[self._start + self._size - 1]
+
+    def clear(self):
+        """Remove all values without releasing the storage."""
+        self._start = 0
+        self._size = 0
+
+
+class SlidingMinMax:
+    """Track the min and max of the last ``window`` appended values.
+
+    Monotonic deques of (index, value) pairs give amortized O(1) appends
+    and O(1) extent queries. NaN values count towards the window but never
+    become the min or max.
+    """
+
+    def __init__(self, window):
+        if window < 1:
+            raise ValueError("window must be at least 1")
+
+        self.window = window
+        self._count = 0
+        self._mins = deque()  # Values increasing from front to back
+        self._maxs = deque()  # Values decreasing from front to back
+
+    def append(self, value):
+        """Add a value, dropping values that fell out of the window."""
+        index = self._count
+        self._count += 1
+
+        if not math.isnan(value):
+            while self._mins and self._mins[-1][1] >= value:
+                self._mins.pop()
+            self._mins.append((index, value))
+
+            while self._maxs and self._maxs[-1][1] <= value:
+                self._maxs.pop()
+            self._maxs.append((index, value))
+
+        oldest = self._count - self.window
+        while self._mins and self._mins[0][0] < oldest:
+            self._mins.popleft()
+        while self._maxs and self._maxs[0][0] < oldest:
+            self._maxs.popleft()
+
+    def extend(self, values):
+        """Add several values in order."""
+        # Values older than the window can't affect the extent; just count them
+        skipped = max(len(values) - self.window, 0)
+        self._count += skipped
+        for value in values[skipped:]:
+            self.append(value)
+
+    def extent(self):
+        """Return (min, max) of the window, or None if it holds no values."""
+        if not self._mins:
+            return None
+        return self._mins[0][1], self._maxs[0][1]
+
+    def clear(self):
+        """Forget all values."""
+        self._count = 0
+        self._mins.clear()
+        self._maxs.clear()
@@ -0,0 +1,197 @@
+import json
+import multiprocessing
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+class SharedRingBuffer:
+    """Columnar ring buffer in shared memory, written by one ingestion process.
+
+    The segment holds a small int64 header (format, capacity, field count,
+    length of the field names, and the sequence counter), the field names
+    as JSON, then one float64 row per field. Like RingBuffer, each value is
+    stored twice, at ``i`` and ``i + capacity``, so any run of up to
+    capacity consecutive samples is one contiguous slice and a read is a
+    single copy per field.
+
+    The sequence counter is the total number of samples ever written. The
+    writer first announces the end of the batch it is about to write,
+    then fills the slots, and publishes them by bumping the counter, so a
+    reader never sees a half-written batch. Samples more than capacity
+    behind the announced end may be being overwritten; reads check this
+    after copying, seqlock-style, and drop such samples as lost.
+    """
+
+    FORMAT_VERSION = 1
+    HEADER_SLOTS = 8
+    SEQUENCE = 4  # Header slot of the sequence counter
+    RESERVED = 5  # Header slot of the end of the batch being written
+
+    def __init__(self, name):
+        """Attach to an existing buffer by its shared-memory name."""
+        self._attach(shared_memory.SharedMemory(name=name))
+        self.owner = False
+
+    @classmethod
+    def create(cls, fields, capacity=65536):
+        """Allocate a new buffer; the creating process owns and unlinks it."""
+        fields = list(fields)
+        if 'timestamps' not in fields:
+            fields.insert(0, 'timestamps')
+
+        names = json.dumps(fields).encode()
+        names_size = -(-len(names) // 8) * 8
+        size = 8 * cls.HEADER_SLOTS + names_size + 8 * len(fields) * 2 * capacity
+        shm = shared_memory.SharedMemory(create=True, size=size)
+
+        header = np.ndarray(cls.HEADER_SLOTS, dtype=np.int64, buffer=shm.buf)
+        header[:] = 0
+        header[:4] = (cls.FORMAT_VERSION, capacity, len(fields), len(names))
+        shm.buf[8 * cls.HEADER_SLOTS:8 * cls.HEADER_SLOTS + len(names)] = names
+        del header
+
+        ring = cls.__new__(cls)
+        ring._attach(shm)
+        ring.owner = True
+        return ring
+
+    def _attach(self, shm):
+        """Map the header, field names and data of a segment."""
+        self.shm = shm
+        self.name = shm.name
+        self._header = np.ndarray(self.HEADER_SLOTS, dtype=np.int64, buffer=shm.buf)
+        version, capacity, n_fields, names_length = (int(value) for value in self._header[:4])
+        if version != self.FORMAT_VERSION:
+            raise ValueError(f"unsupported shared ring format: {version}")
+
+        offset = 8 * self.HEADER_SLOTS
+        self.fields = json.loads(bytes(shm.buf[offset:offset + names_length]))
+        self.capacity = capacity
+
+        offset += -(-names_length // 8) * 8
+        data = np.ndarray((n_fields, 2 * capacity), dtype=np.float64, buffer=shm.buf, offset=offset)
+        self._rows = dict(zip(self.fields, data))
+
+    @property
+    def sequence(self):
+        """Total number of samples written so far."""
+        return int(self._header[self.SEQUENCE])
+
+    def append(self, samples):
+        """Write samples given as a dict of scalars or equal-length sequences.
+
+        Only one process may write. Fields missing from samples are stored
+        as NaN; fields the buffer doesn't have are ignored.
+        """
+        size = len(np.atleast_1d(samples['timestamps']))
+        # A batch longer than the buffer would overwrite its own start
+        count = min(size, self.capacity)
+        if count == 0:
+            return
+
+        sequence = self.sequence
+        # Announce the slots about to be overwritten before touching them
+        self._header[self.RESERVED] = sequence + count
+        positions = (sequence + np.arange(count)) % self.capacity
+        for field, row in self._rows.items():
+            values = np.broadcast_to(np.asarray(samples.get(field, np.nan), dtype=float), (size,))
+            values = values[size - count:]
+            row[positions] = values
+            row[positions + self.capacity] = values
+
+        # Publish the batch only once its slots are written
+        self._header[self.SEQUENCE] = sequence + count
+
+    def read(self, since):
+        """Return (columns, sequence) for the samples written after sequence since.
+
+        Columns are copies taken out of shared memory. Samples the writer
+        overwrote before or while they were copied are lost: if more than
+        capacity samples were written since, or the writer lapped the
+        oldest ones during the copy, only the newer samples are returned
+        (columns is None if none are left).
+        """
+        sequence = self.sequence
+        start = max(since, sequence - self.capacity)
+        count = sequence - start
+        if count <= 0:
+            return None, sequence
+
+        position = start % self.capacity
+        columns = {field: row[position:position + count].copy() for field, row in self._rows.items()}
+
+        # Slots of samples below the announced end minus capacity may have
+        # been rewritten while they were copied
+        valid_from = int(self._header[self.RESERVED]) - self.capacity
+        if valid_from > start:
+            if valid_from >= sequence:
+                return None, sequence
+            columns = {field: values[valid_from - start:] for field, values in columns.items()}
+        return columns, sequence
+
+    def close(self):
+        """Detach from the segment, and free it if this process created it."""
+        self._header = None
+        self._rows = {}
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class SharedRingReader:
+    """Per-consumer read position in a SharedRingBuffer."""
+
+    def __init__(self, ring, from_start=False):
+        self.ring = ring
+        self.position = 0 if from_start else ring.sequence
+        self.lost = 0  # Samples overwritten before this reader got to them
+
+    def read_new(self):
+        """Columns of the samples written since the last call, or None."""
+        columns, sequence = self.ring.read(self.position)
+        received = 0 if columns is None else len(columns['timestamps'])
+        self.lost += sequence - self.position - received
+        self.position = sequence
+        return columns
+
+
+def _run_ingest(name, produce, args):
+    """Ingestion process: write every batch produce() yields into the ring."""
+    ring = SharedRingBuffer(name)
+    try:
+        for samples in produce(*args):
+            ring.append(samples)
+    finally:
+        ring.close()
+
+
+class IngestProcess:
+    """Run an ingestion generator in a separate process, off the GUI's GIL.
+
+    produce(*args) must be a picklable top-level function yielding batches
+    of samples as dicts of columns (parsing, validation and derived fields
+    such as feels-like temperature all happen in that process). The GUI
+    attaches readers to the shared ring and reads new samples each frame.
+    """
+
+    def __init__(self, produce, fields, capacity=65536, args=()):
+        self.ring = SharedRingBuffer.create(fields, capacity)
+        self.process = multiprocessing.Process(target=_run_ingest, name='weather-ingest',
+                                               args=(self.ring.name, produce, args), daemon=True)
+
+    def start(self):
+        """Start the ingestion process."""
+        self.process.start()
+        return self
+
+    def reader(self, from_start=False):
+        """A new reader of the ring."""
+        return SharedRingReader(self.ring, from_start=from_start)
+
+    def stop(self):
+        """Terminate the process and free the shared memory."""
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process.join()
+        self.ring.close()
@@ -1,17 +1,10 @@
-import tkinter as tk
-from tkinter import ttk
-import matplotlib
-matplotlib.use('TkAgg')  # Ensure we're using the Tkinter backend
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
-from matplotlib.figure import Figure
-import matplotlib.pyplot as plt
+from collections import deque
+
 import numpy as np
-from datetime import datetime, timedelta
-import json
-from hovertooltip import HoverTooltip
-from interactiveoverlays import WeatherOverlay
-import matplotlib.animation as animation
 from matplotlib.animation import FuncAnimation
+from interactiveoverlays import WeatherOverlay
+from ringbuffer import RingBuffer, SlidingMinMax
+from blitmanager import BlitManager
 
 class AnimatedWeatherChart:
     def __init__(self, figure, ax, max_points=100):
@@ -19,10 +12,13 @@ class AnimatedWeatherChart:
         self.ax = ax
         self.max_points = max_points
         
-        # Initialize data buffers
-        self.time_buffer = []
+        # Initialize data buffers (preallocated ring buffers, see add_series)
+        self.time_buffer = RingBuffer(max_points)
         self.data_buffers = {}
         
+        # Running min/max per series over the same window, for the y-limits
+        self.extents = {}
+        
         # Initialize line objects
         self.lines = {}
         
@@ -30,21 +26,61 @@ class AnimatedWeatherChart:
         self.animation = None
         self.is_paused = False
         
+        # SampleQueue filled by feed threads, drained once per frame
+        self.feed_queue = None
+        
+        # SharedRingReader of an ingestion process, read once per frame
+        self.shared_reader = None
+        
+        # AnomalyDetector checking new samples, and the (time, value) of the
+        # anomalies still in the window, drawn as one marker scatter
+        self.anomaly_detector = None
+        self.anomaly_overlay = None
+        self.anomalies = deque()
+        
         # Performance optimization
         self.use_blitting = True
+        self.blit_manager = None
+        
+        # Axis limits move in steps so most frames can be blitted:
+        # the x-axis jumps ahead by scroll_step of the window when the newest
+        # sample reaches the right edge, and the y-axis is only re-fitted
+        # when the data leaves the view or shrinks past the hysteresis band
+        self.scroll_step = 0.25
+        self.y_hysteresis = 0.2
+        self._xlim = None
+        self._ylim = None
     
     def add_series(self, name, color='blue', style='-', linewidth=2):
         """Add a data series to animate."""
         line, = self.ax.plot([], [], color=color, linestyle=style, 
                            linewidth=linewidth, label=name)
         self.lines[name] = line
-        self.data_buffers[name] = []
+        if self.blit_manager is not None:
+            self.blit_manager.add_artist(line)
+        
+        # Pad with gaps so the new series lines up with the existing timestamps
+        buffer = RingBuffer(self.max_points)
+        extent = SlidingMinMax(self.max_points)
+        for _ in range(len(self.time_buffer)):
+            buffer.append(np.nan)
+            extent.append(np.nan)
+        self.data_buffers[name] = buffer
+        self.extents[name] = extent
         
         return line
     
     def start_animation(self, update_interval=1000):
         """Start the animation."""
         if self.animation is None:
+            if self.use_blitting:
+                # Lines are blitted over a background cached after each full draw
+                self.blit_manager = BlitManager.for_canvas(self.figure.canvas)
+                for line in self.lines.values():
+                    self.blit_manager.add_artist(line)
+                if self.anomaly_overlay is not None:
+                    self.blit_manager.add_artist(self.anomaly_overlay.anomaly_markers)
+            
             self.animation = FuncAnimation(
                 self.figure,
                 self._animate,
@@ -60,51 +96,173 @@ class AnimatedWeatherChart:
     
     def pause_animation(self):
         """Pause/resume the animation."""
-        if self.animation:
-            if self.is_paused:
-                self.animation.resume()
-            else:
-                self.animation.pause()
-            self.is_paused = not self.is_paused
+        if self.is_paused:
+            self.resume()
+        else:
+            self.pause()
+    
+    def pause(self):
+        """Stop the frame timer, e.g. while the chart's tab is hidden."""
+        if self.animation and not self.is_paused:
+            self.animation.pause()
+            self.is_paused = True
+    
+    def resume(self):
+        """Restart the frame timer after pause()."""
+        if self.animation and self.is_paused:
+            self.animation.resume()
+            self.is_paused = False
     
     def add_data_point(self, timestamp, data_dict):
         """Add a new data point to the animation buffers."""
+        # Ring buffers drop the oldest sample themselves once max_points is reached
         self.time_buffer.append(timestamp)
         
-        for name, value in data_dict.items():
-            if name in self.data_buffers:
-                self.data_buffers[name].append(value)
+        # Series missing from this sample get a gap so all buffers stay aligned
+        for name, buffer in self.data_buffers.items():
+            value = data_dict.get(name, np.nan)
+            buffer.append(value)
+            self.extents[name].append(value)
+        
+        if self.anomaly_detector is not None:
+            for name, value, flags in self.anomaly_detector.update(timestamp, data_dict):
+                self.anomalies.append((timestamp, value))
+    
+    def add_data_points(self, timestamps, data_dict):
+        """Add a batch of samples, given as columns, to the animation buffers."""
+        timestamps = np.asarray(timestamps, dtype=float)
+        self.time_buffer.extend(timestamps)
+        
+        for name, buffer in self.data_buffers.items():
+            values = data_dict.get(name)
+            if values is None:
+                values = np.full(len(timestamps), np.nan)
+            buffer.extend(values)
+            self.extents[name].extend(values)
+        
+        if self.anomaly_detector is not None:
+            for name, (indices, flags) in self.anomaly_detector.extend(timestamps, data_dict).items():
+                values = np.asarray(data_dict[name], dtype=float)
+                self.anomalies.extend(zip(timestamps[indices].tolist(), values[indices].tolist()))
+    
+    def attach_feed(self, sample_queue):
+        """Take samples from a SampleQueue at each frame instead of via add_data_point.
         
-        # Limit buffer size
-        if len(self.time_buffer) > self.max_points:
-            self.time_buffer.pop(0)
-            for buffer in self.data_buffers.values():
-                buffer.pop(0)
+        Producers can run at any rate on their own threads; the chart
+        ingests whatever arrived since the last frame.
+        """
+        self.feed_queue = sample_queue
+    
+    def _drain_feed(self):
+        """Move queued samples into the buffers."""
+        samples = self.feed_queue.drain()
+        # Only the newest max_points can still be on screen
+        for timestamp, data_dict in samples[-self.max_points:]:
+            self.add_data_point(timestamp, data_dict)
+    
+    def attach_shared_ring(self, reader):
+        """Read new samples from a SharedRingReader at each frame.
+        
+        Series are matched to ring fields by name.
+        """
+        self.shared_reader = reader
+    
+    def attach_anomaly_detector(self, detector):
+        """Check every new sample with an AnomalyDetector and mark the anomalies.
+        
+        The detector's fields are series names. Markers scroll out with
+        their samples; all of them are one scatter updated each frame.
+        """
+        self.anomaly_detector = detector
+        self.anomalies.clear()
+        if self.anomaly_overlay is None:
+            self.anomaly_overlay = WeatherOverlay(self.ax)
+            markers = self.anomaly_overlay.set_anomaly_markers([], [])
+            if self.blit_manager is not None:
+                self.blit_manager.add_artist(markers)
+    
+    def _update_anomaly_markers(self):
+        """Drop anomalies that left the window and move the markers."""
+        first = self.time_buffer.first() if len(self.time_buffer) else np.inf
+        while self.anomalies and self.anomalies[0][0] < first:
+            self.anomalies.popleft()
+        
+        if self.anomalies:
+            times, values = zip(*self.anomalies)
+        else:
+            times, values = [], []
+        return self.anomaly_overlay.set_anomaly_markers(times, values)
     
     def _animate(self, frame):
         """Animation update function."""
+        if self.feed_queue is not None:
+            self._drain_feed()
+        
+        if self.shared_reader is not None:
+            columns = self.shared_reader.read_new()
+            if columns is not None:
+                self.add_data_points(columns['timestamps'], columns)
+        
         artists = []
+        times = self.time_buffer.view()
         
         for name, line in self.lines.items():
             if name in self.data_buffers and len(self.data_buffers[name]) > 0:
-                line.set_data(self.time_buffer, self.data_buffers[name])
+                line.set_data(times, self.data_buffers[name].view())
                 artists.append(line)
         
+        if self.anomaly_overlay is not None:
+            artists.append(self._update_anomaly_markers())
+        
         # Update axis limits
         if len(self.time_buffer) > 0:
-            self.ax.set_xlim(self.time_buffer[0], self.time_buffer[-1])
+            self._update_xlim(self.time_buffer.first(), self.time_buffer.last())
             
-            # Calculate y-limits
-            all_values = []
-            for buffer in self.data_buffers.values():
-                all_values.extend(buffer)
+            # Read y-limits from the running extents instead of rescanning buffers
+            extents = [extent.extent() for extent in self.extents.values()]
+            extents = [extent for extent in extents if extent is not None]
             
-            if all_values:
-                ymin, ymax = min(all_values), max(all_values)
-                margin = (ymax - ymin) * 0.1
-                self.ax.set_ylim(ymin - margin, ymax + margin)
+            if extents:
+                ymin = min(extent[0] for extent in extents)
+                ymax = max(extent[1] for extent in extents)
+                self._update_ylim(ymin, ymax)
+        
+        if self.blit_manager is None:
+            return artists
+        
+        # Blit the lines ourselves. If the limits moved above, the cached
+        # background was invalidated and this does one full redraw instead,
+        # which refreshes ticks and grid. Returning no artists keeps
+        # FuncAnimation from blitting over a background with stale ticks.
+        self.blit_manager.update()
+        return []
+    
+    def _update_xlim(self, first, last):
+        """Scroll the x-axis in steps once the newest sample passes the right edge."""
+        span = last - first
+        if span <= 0:
+            return
+        
+        if self._xlim is not None and self._xlim[0] <= first and last <= self._xlim[1]:
+            return
+        
+        self._xlim = (first, last + span * self.scroll_step)
+        self.ax.set_xlim(*self._xlim)
+    
+    def _update_ylim(self, ymin, ymax):
+        """Re-fit the y-axis only when the data leaves the view or shrinks well inside it."""
+        margin = (ymax - ymin) * 0.1 or abs(ymax) * 0.1 or 1.0
+        target_span = (ymax - ymin) + 2 * margin
+        
+        if self._ylim is not None:
+            lo, hi = self._ylim
+            inside = lo <= ymin and ymax <= hi
+            if inside and (hi - lo) <= target_span * (1 + 2 * self.y_hysteresis):
+                return
         
-        return artists
+        pad = margin + target_span * self.y_hysteresis / 2
+        self._ylim = (ymin - pad, ymax + pad)
+        self.ax.set_ylim(*self._ylim)
     
     def create_transition_animation(self, old_data, new_data, duration=1000):
         """Create smooth transition between datasets."""
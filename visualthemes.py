@@ -1,17 +1,6 @@
-import tkinter as tk
-from tkinter import ttk
 import matplotlib
-matplotlib.use('TkAgg')  # Ensure we're using the Tkinter backend
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
-from matplotlib.figure import Figure
-import matplotlib.pyplot as plt
+import matplotlib.colors
 import numpy as np
-from datetime import datetime, timedelta
-import json
-from hovertooltip import HoverTooltip
-from interactiveoverlays import WeatherOverlay
-import matplotlib.animation as animation
-from matplotlib.animation import FuncAnimation
 
 
 class WeatherChartTheme:
@@ -147,7 +136,7 @@ class WeatherChartTheme:
                alpha=theme['grid.alpha'])
         
         # Apply font settings
-        plt.rcParams.update({
+        matplotlib.rcParams.update({
             'font.size': theme['font.size'],
             'font.family': theme['font.family']
         })
@@ -167,7 +156,7 @@ class WeatherChartTheme:
                 return [colors[i % len(colors)] for i in range(n_colors)]
         
         # Default palette
-        return plt.cm.viridis(np.linspace(0, 1, n_colors))
+        return matplotlib.colormaps['viridis'](np.linspace(0, 1, n_colors))
     
     @classmethod
     def apply_gradient_background(cls, ax, direction='vertical', colors=None):
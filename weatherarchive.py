@@ -0,0 +1,185 @@
+import json
+import os
+
+import numpy as np
+
+from weatherdatastore import WeatherDataStore
+
+
+class WeatherArchive:
+    """Persistent columnar weather history, memory-mapped one file per field.
+
+    An archive is a directory holding:
+
+    - ``meta.json`` with the field names and sample count
+    - ``<field>.f8`` per field, raw little-endian float64 values
+    - ``time.idx``, every ``index_stride``-th timestamp
+
+    Opening an archive only reads the metadata and the small time index.
+    Columns are memory-mapped, so slicing a time window pages in just that
+    window, and ``time_slice`` hands the charts a WeatherDataStore of views.
+    Timestamps must be appended in order.
+    """
+
+    DTYPE = np.dtype('<f8')
+    FORMAT_VERSION = 1
+
+    def __init__(self, path):
+        self.path = path
+        with open(self._meta_path(), 'r') as f:
+            meta = json.load(f)
+
+        if meta.get('format') != self.FORMAT_VERSION:
+            raise ValueError(f"unsupported archive format: {meta.get('format')}")
+
+        self._fields = meta['fields']
+        self._count = meta['count']
+        self.index_stride = meta['index_stride']
+        self._index = np.fromfile(os.path.join(path, 'time.idx'), dtype=self.DTYPE)
+        self._map_columns()
+
+        self.version = 0
+
+    @classmethod
+    def create(cls, path, fields, index_stride=4096):
+        """Create an empty archive with the given fields and open it."""
+        fields = list(fields)
+        if 'timestamps' not in fields:
+            fields.insert(0, 'timestamps')
+
+        os.makedirs(path, exist_ok=True)
+        for field in fields:
+            open(os.path.join(path, f'{field}.f8'), 'wb').close()
+        open(os.path.join(path, 'time.idx'), 'wb').close()
+
+        archive = cls.__new__(cls)
+        archive.path = path
+        archive._fields = fields
+        archive._count = 0
+        archive.index_stride = index_stride
+        archive._write_meta()
+        return cls(path)
+
+    def _meta_path(self):
+        return os.path.join(self.path, 'meta.json')
+
+    def _column_path(self, field):
+        return os.path.join(self.path, f'{field}.f8')
+
+    def _write_meta(self):
+        """Replace the metadata atomically so readers never see a partial file."""
+        meta = {
+            'format': self.FORMAT_VERSION,
+            'fields': self._fields,
+            'count': self._count,
+            'index_stride': self.index_stride
+        }
+        tmp_path = self._meta_path() + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self._meta_path())
+
+    def _map_columns(self):
+        """Memory-map every column at the current sample count."""
+        self._columns = {}
+        for field in self._fields:
+            if self._count == 0:
+                # mmap can't map an empty file
+                self._columns[field] = np.empty(0, dtype=self.DTYPE)
+            else:
+                self._columns[field] = np.memmap(self._column_path(field), dtype=self.DTYPE,
+                                                 mode='r', shape=(self._count,))
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def __contains__(self, field):
+        return field in self._columns
+
+    def __getitem__(self, field):
+        return self._columns[field]
+
+    def get(self, field, default=None):
+        return self._columns.get(field, default)
+
+    def keys(self):
+        return self._columns.keys()
+
+    def items(self):
+        return self._columns.items()
+
+    @property
+    def fields(self):
+        return list(self._fields)
+
+    def append(self, samples):
+        """Append samples given as a dict of scalars or equal-length sequences.
+
+        Fields missing from samples are stored as NaN; new fields are added
+        to the archive and backfilled with NaN.
+        """
+        timestamps = np.atleast_1d(np.asarray(samples['timestamps'], dtype=self.DTYPE))
+        count = len(timestamps)
+        if count == 0:
+            return
+
+        if np.any(np.diff(timestamps) < 0) or (self._count and timestamps[0] < self['timestamps'][-1]):
+            raise ValueError("timestamps must be appended in increasing order")
+
+        for field in samples:
+            if field not in self._columns:
+                self._add_field(field)
+
+        for field in self._fields:
+            values = np.broadcast_to(np.asarray(samples.get(field, np.nan), dtype=self.DTYPE), (count,))
+            with open(self._column_path(field), 'ab') as f:
+                f.write(np.ascontiguousarray(values).tobytes())
+
+        # Extend the sparse time index with every stride-th new timestamp
+        old = self._count
+        first = -(-old // self.index_stride) * self.index_stride
+        indexed = timestamps[first - old::self.index_stride]
+        if len(indexed):
+            with open(os.path.join(self.path, 'time.idx'), 'ab') as f:
+                f.write(indexed.tobytes())
+            self._index = np.concatenate([self._index, indexed])
+
+        self._count += count
+        self._write_meta()
+        self._map_columns()
+        self.version += 1
+
+    def _add_field(self, field):
+        """Add a column backfilled with NaN."""
+        with open(self._column_path(field), 'wb') as f:
+            f.write(np.full(self._count, np.nan, dtype=self.DTYPE).tobytes())
+        self._fields.append(field)
+        self._columns[field] = None
+
+    def _search(self, value, side):
+        """Binary search the timestamps, touching one index block on disk."""
+        block = np.searchsorted(self._index, value, side=side)
+        lo = max(block - 1, 0) * self.index_stride
+        hi = min(block * self.index_stride + 1, self._count)
+        return lo + int(np.searchsorted(self['timestamps'][lo:hi], value, side=side))
+
+    def index_range(self, start=None, end=None):
+        """Index slice of the samples with start <= timestamp <= end."""
+        lo = 0 if start is None else self._search(start, 'left')
+        hi = self._count if end is None else self._search(end, 'right')
+        return slice(lo, max(lo, hi))
+
+    def time_slice(self, start=None, end=None):
+        """WeatherDataStore of memory-mapped views over a time window."""
+        window = self.index_range(start, end)
+        return WeatherDataStore._from_views({
+            field: self._columns[field][window] for field in self._fields
+        })
+
+    def close(self):
+        """Release the memory maps."""
+        self._columns = {field: np.empty(0, dtype=self.DTYPE) for field in self._fields}
+        self._count = 0
@@ -0,0 +1,140 @@
+import numpy as np
+
+
+class WeatherDataStore:
+    """Columnar weather data with one contiguous float64 array per field.
+
+    Columns are read like a dict (``store['temperature']``, ``'feels_like'
+    in store``, ``store.get(...)``) so the store can be passed anywhere the
+    old dict of lists was accepted. ``len(store)`` is the number of samples,
+    as with a DataFrame. Columns are returned as read-only views, so no
+    conversions happen on the way to the charts, and ``version`` increases
+    on every change so consumers can tell when to refresh.
+    """
+
+    def __init__(self, data=None, capacity=0):
+        data = dict(data or {})
+        data.setdefault('timestamps', [])
+
+        columns = {name: np.asarray(values, dtype=float).ravel() for name, values in data.items()}
+        size = len(columns['timestamps'])
+        for name, values in columns.items():
+            if len(values) != size:
+                raise ValueError(f"column '{name}' has {len(values)} values, expected {size}")
+
+        self._size = size
+        self._capacity = max(capacity, size)
+        self._columns = {}
+        for name, values in columns.items():
+            column = np.full(self._capacity, np.nan)
+            column[:size] = values
+            self._columns[name] = column
+
+        self.version = 0
+
+    @classmethod
+    def _from_views(cls, columns):
+        """Build a store over existing arrays without copying them."""
+        store = cls.__new__(cls)
+        store._columns = columns
+        store._size = store._capacity = len(columns['timestamps'])
+        store.version = 0
+        return store
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        return iter(self._columns)
+
+    def __contains__(self, field):
+        return field in self._columns
+
+    def __getitem__(self, field):
+        view = self._columns[field][:self._size]
+        view.flags.writeable = False
+        return view
+
+    def get(self, field, default=None):
+        return self[field] if field in self._columns else default
+
+    def keys(self):
+        return self._columns.keys()
+
+    def items(self):
+        return [(field, self[field]) for field in self._columns]
+
+    @property
+    def fields(self):
+        return list(self._columns)
+
+    def add_field(self, field, values=None):
+        """Add a column, filled with NaN unless values are given."""
+        column = np.full(self._capacity, np.nan)
+        if values is not None:
+            values = np.asarray(values, dtype=float).ravel()
+            if len(values) != self._size:
+                raise ValueError(f"column '{field}' has {len(values)} values, expected {self._size}")
+            column[:self._size] = values
+        self._columns[field] = column
+        self.version += 1
+
+    def append(self, samples):
+        """Append samples given as a dict of scalars or equal-length sequences.
+
+        Fields missing from samples are filled with NaN. Storage grows by
+        doubling, so appends are amortized O(samples added).
+        """
+        timestamps = np.atleast_1d(np.asarray(samples['timestamps'], dtype=float))
+        count = len(timestamps)
+        if count == 0:
+            return
+
+        for field in samples:
+            if field not in self._columns:
+                self.add_field(field)
+
+        self._reserve(self._size + count)
+        new = slice(self._size, self._size + count)
+        for field, column in self._columns.items():
+            column[new] = samples.get(field, np.nan)
+
+        self._size += count
+        self.version += 1
+
+    def _reserve(self, size):
+        """Grow the columns to hold at least size samples."""
+        if size <= self._capacity:
+            return
+
+        capacity = max(size, 2 * self._capacity, 64)
+        for field, column in self._columns.items():
+            grown = np.full(capacity, np.nan)
+            grown[:self._size] = column[:self._size]
+            self._columns[field] = grown
+        self._capacity = capacity
+
+    def index_range(self, start=None, end=None):
+        """Index slice of the samples with start <= timestamp <= end.
+
+        Timestamps are expected to be sorted, as they are for any station
+        feed, so this is a binary search.
+        """
+        timestamps = self['timestamps']
+        lo = 0 if start is None else np.searchsorted(timestamps, start, side='left')
+        hi = self._size if end is None else np.searchsorted(timestamps, end, side='right')
+        return slice(int(lo), int(hi))
+
+    def time_slice(self, start=None, end=None):
+        """Store of the samples between start and end, sharing memory with this one."""
+        window = self.index_range(start, end)
+        return WeatherDataStore._from_views({
+            field: column[:self._size][window] for field, column in self._columns.items()
+        })
+
+    def tail(self, count):
+        """Store of the last count samples, sharing memory with this one."""
+        start = max(self._size - count, 0)
+        return WeatherDataStore._from_views({
+            field: column[start:self._size] for field, column in self._columns.items()
+        })
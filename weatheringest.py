@@ -0,0 +1,223 @@
+import csv
+import os
+import queue
+import re
+import threading
+from itertools import islice
+
+import numpy as np
+import matplotlib.dates as mdates
+
+
+# Header names station exports use for the time column
+TIME_COLUMNS = ('timestamps', 'timestamp', 'time', 'date', 'datetime')
+
+
+def _field_name(header):
+    """Normalize a column header to the field names the charts use."""
+    name = header.strip().lower().replace(' ', '_').replace('-', '_')
+    return 'timestamps' if name in TIME_COLUMNS else name
+
+
+# Lines handed to numpy's parser at a time
+PARSE_BLOCK_ROWS = 4096
+
+# An empty CSV cell: between two delimiters, or at the start or end of a line
+EMPTY_CELL = re.compile(r'(?<=,)(?=,|$)|^(?=,)', re.MULTILINE)
+
+
+def _to_date_numbers(values):
+    """Convert timestamps to matplotlib date numbers.
+
+    Numeric columns are taken to be date numbers already; anything else is
+    parsed as ISO 8601 date strings.
+    """
+    values = np.asarray(values)
+    if values.dtype.kind in 'fiu':
+        return values.astype(float)
+    if values.dtype.kind == 'M':
+        return mdates.date2num(values)
+
+    try:
+        return values.astype(float)
+    except ValueError:
+        return mdates.date2num(np.asarray(values, dtype=str).astype('datetime64[ms]'))
+
+
+def read_csv_chunks(path, chunk_rows=100000, first_chunk_rows=None):
+    """Yield a CSV export as dicts of float64 columns, chunk_rows rows at a time.
+
+    Only one chunk of lines is held in memory, and each chunk is converted
+    by numpy's C parser rather than cell by cell. first_chunk_rows makes
+    the first chunk smaller so something can be drawn before the rest is
+    parsed.
+    """
+    with open(path, 'r') as f:
+        fields = [_field_name(header) for header in next(csv.reader([f.readline()]))]
+        if 'timestamps' not in fields:
+            raise ValueError(f"{path} has no time column (expected one of {', '.join(TIME_COLUMNS)})")
+
+        time_column = fields.index('timestamps')
+        value_columns = [i for i in range(len(fields)) if i != time_column]
+
+        size = first_chunk_rows or chunk_rows
+        while True:
+            # numpy's parser holds the GIL, so parse in short blocks to let
+            # the GUI thread run in between
+            blocks = []
+            remaining = size
+            while remaining:
+                lines = list(islice(f, min(remaining, PARSE_BLOCK_ROWS)))
+                if not lines:
+                    break
+                blocks.append(_parse_csv_block(lines, time_column, value_columns))
+                remaining -= len(lines)
+
+            if not blocks:
+                return
+
+            chunk = {'timestamps': np.concatenate([block[0] for block in blocks])}
+            values = np.concatenate([block[1] for block in blocks])
+            for i, column in enumerate(value_columns):
+                chunk[fields[column]] = np.ascontiguousarray(values[:, i])
+            yield chunk
+            size = chunk_rows
+
+
+def _parse_csv_block(lines, time_column, value_columns):
+    """Parse CSV lines into date numbers and a 2-D array of values."""
+    # Empty cells are missing readings
+    lines = EMPTY_CELL.sub('nan', ''.join(lines)).splitlines()
+    timestamps = np.loadtxt(lines, delimiter=',', usecols=[time_column], dtype=str,
+                            quotechar='"', ndmin=1)
+    values = np.loadtxt(lines, delimiter=',', usecols=value_columns, dtype=float,
+                        quotechar='"', ndmin=2)
+    return _to_date_numbers(timestamps), values
+
+
+def read_parquet_chunks(path, chunk_rows=100000, first_chunk_rows=None):
+    """Yield a Parquet export as dicts of float64 columns, one batch at a time.
+
+    Needs pyarrow.
+    """
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("reading Parquet files requires pyarrow") from None
+
+    parquet = pq.ParquetFile(path)
+    fields = [_field_name(name) for name in parquet.schema_arrow.names]
+    if 'timestamps' not in fields:
+        raise ValueError(f"{path} has no time column (expected one of {', '.join(TIME_COLUMNS)})")
+
+    # Row groups bound what pyarrow decodes at once; a smaller first batch
+    # comes from splitting the first one
+    for number, batch in enumerate(parquet.iter_batches(batch_size=chunk_rows)):
+        pieces = [batch]
+        if number == 0 and first_chunk_rows and first_chunk_rows < batch.num_rows:
+            pieces = [batch.slice(0, first_chunk_rows), batch.slice(first_chunk_rows)]
+
+        for piece in pieces:
+            chunk = {}
+            for field, column in zip(fields, piece.columns):
+                values = column.to_numpy(zero_copy_only=False)
+                if field == 'timestamps':
+                    chunk[field] = _to_date_numbers(values)
+                else:
+                    chunk[field] = np.asarray(values, dtype=float)
+            yield chunk
+
+
+def read_chunks(path, chunk_rows=100000, first_chunk_rows=None):
+    """Yield the chunks of a CSV or Parquet export, chosen by file extension."""
+    if os.path.splitext(path)[1].lower() in ('.parquet', '.pq'):
+        return read_parquet_chunks(path, chunk_rows, first_chunk_rows)
+    return read_csv_chunks(path, chunk_rows, first_chunk_rows)
+
+
+class ChunkedLoader:
+    """Parse a weather export on a worker thread and hand chunks to the GUI.
+
+    The worker never touches Tk. Parsed chunks wait in a queue of at most
+    max_pending entries, so a slow consumer stalls the parser instead of
+    letting chunks pile up, and the GUI thread drains the queue from a
+    periodic schedule(ms, fn) callback such as a widget's after.
+    """
+
+    def __init__(self, path, on_chunk, schedule, chunk_rows=100000, first_chunk_rows=5000,
+                 max_pending=2, poll_ms=20, on_done=None, on_error=None):
+        self.path = path
+        self.on_chunk = on_chunk
+        self.on_done = on_done
+        self.on_error = on_error
+        self.schedule = schedule
+        self.chunk_rows = chunk_rows
+        self.first_chunk_rows = first_chunk_rows
+        self.poll_ms = poll_ms
+
+        self.chunks = queue.Queue(maxsize=max_pending)
+        self.rows_loaded = 0
+        self.finished = False
+        self._cancelled = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start parsing and polling for chunks."""
+        self._thread = threading.Thread(target=self._run, name='weather-ingest', daemon=True)
+        self._thread.start()
+        self.schedule(self.poll_ms, self._poll)
+
+    def cancel(self):
+        """Stop parsing; chunks not yet delivered are dropped."""
+        self._cancelled.set()
+        self.finished = True
+
+    def _put(self, item):
+        """Queue an item for the GUI, giving up if the load is cancelled."""
+        while not self._cancelled.is_set():
+            try:
+                self.chunks.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _run(self):
+        """Worker thread: parse the file into the queue."""
+        try:
+            for chunk in read_chunks(self.path, self.chunk_rows, self.first_chunk_rows):
+                if not self._put(chunk):
+                    return
+            self._put(None)
+        except Exception as error:
+            self._put(error)
+
+    def _poll(self):
+        """GUI thread: deliver one parsed chunk, then poll again.
+
+        One chunk per call keeps each slice of GUI time short; the next
+        call comes straight away while chunks are waiting.
+        """
+        if self.finished:
+            return
+
+        try:
+            item = self.chunks.get_nowait()
+        except queue.Empty:
+            self.schedule(self.poll_ms, self._poll)
+            return
+
+        if item is None or isinstance(item, Exception):
+            self.finished = True
+            if item is None:
+                if self.on_done is not None:
+                    self.on_done()
+            elif self.on_error is not None:
+                self.on_error(item)
+            else:
+                raise item
+            return
+
+        self.rows_loaded += len(item['timestamps'])
+        self.on_chunk(item)
+        self.schedule(1, self._poll)